@@ -0,0 +1,31 @@
+import os
+import sys
+import time
+import random
+import string
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+import _dedup
+
+
+def random_word(rng):
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9))).capitalize()
+
+
+def main(total_entries=50000, chunk_size=5000, seed=42):
+    rng = random.Random(seed)
+    authors = [f"{random_word(rng)} {random_word(rng)}" for _ in range(total_entries // 8)]
+    dedup_index = _dedup.Dedup_Index()
+
+    print(f"{'Entries':>10} {'Insert us/op':>14}")
+    for chunk_start in range(0, total_entries, chunk_size):
+        books = [(rng.choice(authors), " ".join(random_word(rng) for _ in range(rng.randint(1, 5)))) for _ in range(chunk_size)]
+        start = time.perf_counter()
+        for author, title in books:
+            dedup_index.add_if_new(author, title)
+        elapsed = time.perf_counter() - start
+        print(f"{chunk_start + chunk_size:>10} {elapsed / chunk_size * 1000000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
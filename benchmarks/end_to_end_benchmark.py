@@ -0,0 +1,201 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+import fake_services
+
+
+def summarize(durations):
+    ordered = sorted(durations)
+    if not ordered:
+        return {"Runs": 0}
+    return {
+        "Runs": len(ordered),
+        "Mean": round(statistics.mean(ordered), 6),
+        "Median": round(statistics.median(ordered), 6),
+        "P95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 6),
+        "Max": round(ordered[-1], 6),
+    }
+
+
+def configure_environment(readarr, args):
+    os.environ.update(
+        {
+            "readarr_address": readarr.address,
+            "readarr_api_key": "benchmark",
+            "readarr_wait_delay": "0",
+            "thread_limit": str(args.thread_limit),
+            "crawl_max_depth": str(args.crawl_max_depth),
+            "goodreads_http_fast_path": "true",
+            "goodreads_requests_per_second": str(args.goodreads_rate),
+            "goodreads_max_requests_per_second": str(args.goodreads_rate),
+            "google_books_prefetch": "false",
+            "recommendation_cache_force_refresh": "true",
+            "auto_start": "false",
+        }
+    )
+
+
+def benchmark_readarr_sync(data_handler, args):
+    durations = []
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        data_handler.request_books_from_readarr()
+        durations.append(time.perf_counter() - start)
+    return {"Library_Books": len(data_handler.readarr_items), "Seconds": summarize(durations), "Last_Phases": {phase: round(duration, 6) for phase, duration in data_handler.readarr_sync.phase_timings.items()}}
+
+
+def benchmark_find_similar_books(data_handler, goodreads, args):
+    seeds = [item["name"] for item in data_handler.readarr_items[: args.seeds]]
+    data_handler.result_store.clear()
+    data_handler.recommended_books_index.clear()
+    data_handler.ranking_engine.clear()
+    data_handler.crawl_scheduler.start(seeds)
+    data_handler.search_exhausted_flag = False
+    data_handler.stop_event.clear()
+
+    rounds = []
+    requests_before = goodreads.request_count
+    total_start = time.perf_counter()
+    for _ in range(args.rounds):
+        books_before = len(data_handler.result_store)
+        start = time.perf_counter()
+        data_handler.find_similar_books()
+        rounds.append({"Seconds": round(time.perf_counter() - start, 6), "New_Books": len(data_handler.result_store) - books_before})
+        if data_handler.search_exhausted_flag:
+            break
+    total_seconds = time.perf_counter() - total_start
+
+    return {
+        "Seeds": len(seeds),
+        "Rounds": rounds,
+        "Round_Seconds": summarize([round_result["Seconds"] for round_result in rounds]),
+        "Recommended_Books": len(data_handler.result_store),
+        "Dedup_Entries": len(data_handler.recommended_books_index),
+        "Goodreads_Requests": goodreads.request_count - requests_before,
+        "Books_Per_Second": round(len(data_handler.result_store) / total_seconds, 2) if total_seconds else None,
+    }
+
+
+def benchmark_add_burst(data_handler, readarr, args):
+    burst = data_handler.result_store.all()[: args.add_burst]
+    requests_before = readarr.request_count
+    monitor_requests_before = readarr.monitor_requests
+    start = time.perf_counter()
+    for book in burst:
+        data_handler.add_to_readarr(dict(book))
+    deadline = start + args.timeout
+    while time.perf_counter() < deadline and not all(book["Status"] for book in burst):
+        time.sleep(0.005)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "Books": len(burst),
+        "Seconds": round(elapsed, 6),
+        "Completed": sum(1 for book in burst if book["Status"]),
+        "Added": sum(1 for book in burst if book["Status"] == "Added"),
+        "Readarr_Requests": readarr.request_count - requests_before,
+        "Monitor_Requests": readarr.monitor_requests - monitor_requests_before,
+    }
+
+
+def benchmark_socketio_fan_out(ebookbuddy, args):
+    books = ebookbuddy.data_handler.result_store.all() or [{"Name": "Placeholder", "Author": "Placeholder"}]
+    clients = [ebookbuddy.socketio.test_client(ebookbuddy.app) for _ in range(args.clients)]
+    time.sleep(0.2)
+    for client in clients:
+        client.get_received()
+
+    frames = [books[index : index + 20] for index in range(0, len(books), 20)][: args.frames]
+    start = time.perf_counter()
+    for frame in frames:
+        ebookbuddy.socketio.emit("more_books_loaded", frame)
+    emit_seconds = time.perf_counter() - start
+    delivered = [sum(len(packet["args"][0]) for packet in client.get_received() if packet["name"] == "more_books_loaded") for client in clients]
+    elapsed = time.perf_counter() - start
+
+    for client in clients:
+        client.disconnect()
+
+    sent_items = sum(len(frame) for frame in frames)
+    return {
+        "Clients": len(clients),
+        "Frames": len(frames),
+        "Emit_Seconds": round(emit_seconds, 6),
+        "Seconds": round(elapsed, 6),
+        "Items_Delivered": sum(delivered),
+        "Items_Expected": sent_items * len(clients),
+        "Payload_Bytes": len(json.dumps(frames)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmark against fake Readarr and Goodreads servers")
+    parser.add_argument("--authors", type=int, default=400, help="Authors in the synthetic catalogue")
+    parser.add_argument("--books-per-author", type=int, default=6)
+    parser.add_argument("--library-authors", type=int, default=150, help="Catalogue authors already in the fake Readarr library")
+    parser.add_argument("--related-count", type=int, default=12, help="Similar books on each fake Goodreads book page")
+    parser.add_argument("--seeds", type=int, default=6)
+    parser.add_argument("--rounds", type=int, default=5, help="find_similar_books calls to time")
+    parser.add_argument("--thread-limit", type=int, default=4)
+    parser.add_argument("--goodreads-rate", type=float, default=1000, help="Goodreads requests per second allowed by the rate limiter")
+    parser.add_argument("--crawl-max-depth", type=int, default=2)
+    parser.add_argument("--add-burst", type=int, default=25)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--frames", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--output", default="end_to_end_report.json")
+    args = parser.parse_args()
+    output_path = os.path.abspath(args.output)
+
+    catalogue = fake_services.Synthetic_Catalogue(args.authors, args.books_per_author, args.related_count)
+    readarr = fake_services.Fake_Readarr(catalogue, args.library_authors).start()
+    goodreads = fake_services.Fake_Goodreads(catalogue).start()
+    configure_environment(readarr, args)
+
+    with tempfile.TemporaryDirectory() as work_folder:
+        os.chdir(work_folder)
+        import eBookBuddy
+
+        data_handler = eBookBuddy.data_handler
+        data_handler.goodreads_scraper.base_url = goodreads.address
+        data_handler.goodreads_scraper.http_scraper.base_url = goodreads.address
+
+        results = {}
+        results["readarr_sync"] = benchmark_readarr_sync(data_handler, args)
+        results["find_similar_books"] = benchmark_find_similar_books(data_handler, goodreads, args)
+        results["add_to_readarr_burst"] = benchmark_add_burst(data_handler, readarr, args)
+        results["socketio_fan_out"] = benchmark_socketio_fan_out(eBookBuddy, args)
+        data_handler.stop_event.set()
+
+    readarr.stop()
+    goodreads.stop()
+
+    report = {
+        "Generated": datetime.now(timezone.utc).isoformat(),
+        "Python": platform.python_version(),
+        "Platform": platform.platform(),
+        "Parameters": vars(args),
+        "Results": results,
+    }
+    with open(output_path, "w") as json_file:
+        json.dump(report, json_file, indent=4)
+
+    print(f"{'Benchmark':<24} {'Seconds':>12}")
+    print(f"{'readarr_sync (median)':<24} {results['readarr_sync']['Seconds'].get('Median', 0):>12.4f}")
+    print(f"{'find_similar_books':<24} {sum(round_result['Seconds'] for round_result in results['find_similar_books']['Rounds']):>12.4f}")
+    print(f"{'add_to_readarr_burst':<24} {results['add_to_readarr_burst']['Seconds']:>12.4f}")
+    print(f"{'socketio_fan_out':<24} {results['socketio_fan_out']['Seconds']:>12.4f}")
+    print(f"Report written to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
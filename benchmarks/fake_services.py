@@ -0,0 +1,244 @@
+import os
+import re
+import json
+import random
+import string
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+FIXTURES_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+# Readarr books are GoodReads works, their ids differ from the GoodReads book (edition) ids
+WORK_ID_OFFSET = 1000000
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_FOLDER, name), "r") as fixture_file:
+        return string.Template(fixture_file.read())
+
+
+def random_word(rng):
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9))).capitalize()
+
+
+class Synthetic_Catalogue:
+    def __init__(self, author_count, books_per_author, related_count=12, seed=42):
+        rng = random.Random(seed)
+        self.related_count = related_count
+        self.seed = seed
+        self.authors = [{"id": author_id, "name": f"{random_word(rng)} {random_word(rng)}"} for author_id in range(author_count)]
+        self.books = []
+        for author in self.authors:
+            for _ in range(books_per_author):
+                self.books.append(
+                    {
+                        "id": len(self.books),
+                        "author_id": author["id"],
+                        "author": author["name"],
+                        "title": " ".join(random_word(rng) for _ in range(rng.randint(1, 4))),
+                        "rating": round(rng.uniform(3.0, 4.8), 2),
+                        "votes": rng.randint(100, 250000),
+                    }
+                )
+        self.books_by_author = {}
+        for book in self.books:
+            self.books_by_author.setdefault(book["author_id"], []).append(book)
+
+    def related_books(self, book_id):
+        rng = random.Random(self.seed * 1000003 + book_id)
+        return [book for book in rng.sample(self.books, min(self.related_count, len(self.books))) if book["id"] != book_id]
+
+    def search(self, query):
+        query = query.lower()
+        return [book for book in self.books if f"{book['author']} - {book['title']}".lower() == query][:1] or [book for book in self.books if book["title"].lower() in query][:20]
+
+
+class Fake_Server:
+    def __init__(self, handler_class):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+        self.server.daemon_threads = True
+        self.server.owner = self
+        self.address = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.request_count = 0
+        self.lock = threading.Lock()
+
+    def start(self):
+        thread = threading.Thread(target=self.server.serve_forever, name=f"{type(self).__name__}_Thread")
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def count_request(self):
+        with self.lock:
+            self.request_count += 1
+
+
+class Fake_Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Buffer the response so headers and body leave in one write instead of stalling on delayed ACKs
+    wbufsize = -1
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, status, body, content_type="application/json"):
+        payload = body.encode("utf-8") if isinstance(body, str) else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def read_json(self):
+        content_length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(content_length) or b"{}")
+
+
+class Readarr_Handler(Fake_Handler):
+    def do_GET(self):
+        readarr = self.server.owner
+        readarr.count_request()
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        if url.path == "/api/v1/author":
+            self.send_body(200, readarr.get_authors())
+        elif url.path == "/api/v1/book":
+            author_id = params.get("authorId", [None])[0]
+            self.send_body(200, readarr.get_books(int(author_id) if author_id else None))
+        elif url.path == "/api/v1/author/lookup":
+            self.send_body(200, readarr.lookup_author(params.get("term", [""])[0]))
+        else:
+            self.send_body(404, {"message": "NotFound"})
+
+    def do_POST(self):
+        readarr = self.server.owner
+        readarr.count_request()
+        if urlparse(self.path).path == "/api/v1/author":
+            self.send_body(201, readarr.add_author(self.read_json()))
+        else:
+            self.send_body(404, {"message": "NotFound"})
+
+    def do_PUT(self):
+        readarr = self.server.owner
+        readarr.count_request()
+        if urlparse(self.path).path == "/api/v1/book/monitor":
+            readarr.monitor_books(self.read_json())
+            self.send_body(202, {})
+        else:
+            self.send_body(404, {"message": "NotFound"})
+
+
+class Fake_Readarr(Fake_Server):
+    def __init__(self, catalogue, library_authors):
+        super().__init__(Readarr_Handler)
+        self.catalogue = catalogue
+        self.authors = {}
+        self.books = {}
+        self.monitored_book_ids = set()
+        self.monitor_requests = 0
+        for author in catalogue.authors[:library_authors]:
+            self._add_catalogue_author(author, with_files=True)
+
+    def _add_catalogue_author(self, author, with_files=False):
+        author_books = self.catalogue.books_by_author.get(author["id"], [])
+        readarr_author = {
+            "id": author["id"] + 1,
+            "authorName": author["name"],
+            "foreignAuthorId": str(author["id"]),
+            "monitored": True,
+            "statistics": {"bookCount": len(author_books), "bookFileCount": len(author_books) if with_files else 0, "sizeOnDisk": len(author_books) * 1048576 if with_files else 0},
+        }
+        self.authors[readarr_author["id"]] = readarr_author
+        for position, book in enumerate(author_books):
+            self.books[book["id"] + 1] = {
+                "id": book["id"] + 1,
+                "authorId": readarr_author["id"],
+                "title": book["title"],
+                "foreignBookId": str(book["id"] + WORK_ID_OFFSET),
+                "editions": [{"foreignEditionId": str(book["id"]), "monitored": True}] if position % 2 == 0 else [],
+                "monitored": with_files,
+                "statistics": {"bookFileCount": 1 if with_files else 0},
+            }
+        return readarr_author
+
+    def get_authors(self):
+        with self.lock:
+            return list(self.authors.values())
+
+    def get_books(self, author_id=None):
+        with self.lock:
+            return [book for book in self.books.values() if author_id is None or book["authorId"] == author_id]
+
+    def lookup_author(self, term):
+        return [{"authorName": author["name"], "foreignAuthorId": str(author["id"])} for author in self.catalogue.authors if author["name"].lower() == term.lower()]
+
+    def add_author(self, payload):
+        author = self.catalogue.authors[int(payload["foreignAuthorId"])]
+        with self.lock:
+            return self._add_catalogue_author(author)
+
+    def monitor_books(self, payload):
+        with self.lock:
+            self.monitor_requests += 1
+            self.monitored_book_ids.update(payload.get("bookIds", []))
+
+
+class Goodreads_Handler(Fake_Handler):
+    def do_GET(self):
+        goodreads = self.server.owner
+        goodreads.count_request()
+        url = urlparse(self.path)
+        book_match = re.match(r"^/book/show/(\d+)", url.path)
+        work_match = re.match(r"^/work/best_book/(\d+)", url.path)
+        if url.path == "/search":
+            self.send_body(200, goodreads.render_search(parse_qs(url.query).get("q", [""])[0]), "text/html")
+        elif book_match and int(book_match.group(1)) < len(goodreads.catalogue.books):
+            self.send_body(200, goodreads.render_book(int(book_match.group(1))), "text/html")
+        elif work_match and 0 <= int(work_match.group(1)) - WORK_ID_OFFSET < len(goodreads.catalogue.books):
+            self.send_response(302)
+            self.send_header("Location", f"/book/show/{int(work_match.group(1)) - WORK_ID_OFFSET}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self.send_body(404, "Not Found", "text/html")
+
+
+class Fake_Goodreads(Fake_Server):
+    def __init__(self, catalogue):
+        super().__init__(Goodreads_Handler)
+        self.catalogue = catalogue
+        self.search_page = load_fixture("search_page.html")
+        self.search_row = load_fixture("search_row.html")
+        self.book_page = load_fixture("book_page.html")
+
+    def render_search(self, query):
+        results = self.catalogue.search(query)
+        rows = "\n".join(
+            self.search_row.substitute(book_id=book["id"], title=book["title"], author=book["author"], author_id=book["author_id"], rating=book["rating"], votes=f"{book['votes']:,}", image_url=f"{self.address}/covers/{book['id']}.jpg")
+            for book in results
+        )
+        return self.search_page.substitute(query=query, result_count=len(results), rows=rows)
+
+    def render_book(self, book_id):
+        book = self.catalogue.books[book_id]
+        apollo_state = {"ROOT_QUERY": {f'getSimilarBooks({{"id":"kca://book/{book_id}"}})': {"edges": []}}}
+        edges = apollo_state["ROOT_QUERY"][f'getSimilarBooks({{"id":"kca://book/{book_id}"}})']["edges"]
+        for related_book in self.catalogue.related_books(book_id):
+            book_key = f"Book:{related_book['id']}"
+            work_key = f"Work:{related_book['id']}"
+            contributor_key = f"Contributor:{related_book['author_id']}"
+            apollo_state[book_key] = {
+                "title": related_book["title"],
+                "imageUrl": f"{self.address}/covers/{related_book['id']}.jpg",
+                "work": {"__ref": work_key},
+                "primaryContributorEdge": {"node": {"__ref": contributor_key}},
+            }
+            apollo_state[work_key] = {"stats": {"averageRating": related_book["rating"], "ratingsCount": related_book["votes"]}}
+            apollo_state[contributor_key] = {"name": related_book["author"]}
+            edges.append({"node": {"__ref": book_key}})
+        next_data = json.dumps({"props": {"pageProps": {"apolloState": apollo_state}}})
+        return self.book_page.substitute(title=book["title"], author=book["author"], next_data=next_data)
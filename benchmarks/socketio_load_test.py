@@ -0,0 +1,136 @@
+import json
+import time
+import argparse
+import threading
+import statistics
+from datetime import datetime, timezone
+import socketio
+
+
+def summarize(values):
+    ordered = sorted(value for value in values if value is not None)
+    if not ordered:
+        return {"Samples": 0}
+    return {
+        "Samples": len(ordered),
+        "Mean": round(statistics.mean(ordered), 6),
+        "Median": round(statistics.median(ordered), 6),
+        "P95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 6),
+        "Max": round(ordered[-1], 6),
+    }
+
+
+class Simulated_Client:
+    def __init__(self, client_id, args):
+        self.client_id = client_id
+        self.args = args
+        self.lock = threading.Lock()
+        self.connect_seconds = []
+        self.replay_seconds = []
+        self.sidebar_seconds = []
+        self.failures = 0
+        self.bytes_received = 0
+        self.events_received = {}
+
+    def run(self):
+        for _ in range(self.args.reconnects + 1):
+            self.session()
+
+    def session(self):
+        replay_received = threading.Event()
+        sidebar_received = threading.Event()
+        client = socketio.Client(reconnection=False)
+
+        def record(event, *payload):
+            with self.lock:
+                self.bytes_received += len(json.dumps(payload))
+                self.events_received[event] = self.events_received.get(event, 0) + 1
+            if event == "books_page":
+                replay_received.set()
+            elif event == "readarr_sidebar_update":
+                sidebar_received.set()
+
+        client.on("*", record)
+        session_start = time.perf_counter()
+        try:
+            client.connect(self.args.url, transports=self.args.transports.split(","), wait_timeout=self.args.timeout)
+            self.connect_seconds.append(time.perf_counter() - session_start)
+            if replay_received.wait(self.args.replay_timeout):
+                self.replay_seconds.append(time.perf_counter() - session_start)
+
+            if self.args.open_sidebar:
+                sidebar_start = time.perf_counter()
+                client.emit("side_bar_opened")
+                if sidebar_received.wait(self.args.replay_timeout):
+                    self.sidebar_seconds.append(time.perf_counter() - sidebar_start)
+
+            time.sleep(self.args.hold)
+
+        except Exception:
+            self.failures += 1
+
+        finally:
+            try:
+                client.disconnect()
+            except Exception:
+                pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Connection storm load test for a running eBookBuddy Socket.IO server")
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--reconnects", type=int, default=2, help="Times each client reconnects after its first session")
+    parser.add_argument("--ramp", type=float, default=5.0, help="Seconds over which client start times are spread")
+    parser.add_argument("--hold", type=float, default=1.0, help="Seconds each session stays connected")
+    parser.add_argument("--replay-timeout", type=float, default=3.0, help="Seconds to wait for replayed books or the sidebar")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--transports", default="websocket,polling")
+    parser.add_argument("--open-sidebar", action="store_true", help="Request the Readarr sidebar in every session")
+    parser.add_argument("--output", default="socketio_load_report.json")
+    args = parser.parse_args()
+
+    clients = [Simulated_Client(client_id, args) for client_id in range(args.clients)]
+    threads = []
+    test_start = time.perf_counter()
+    for client in clients:
+        thread = threading.Thread(target=client.run, name=f"Load_Client_{client.client_id}")
+        thread.daemon = True
+        thread.start()
+        threads.append(thread)
+        time.sleep(args.ramp / max(1, args.clients))
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - test_start
+
+    sessions = args.clients * (args.reconnects + 1)
+    bytes_per_client = [client.bytes_received for client in clients]
+    events_received = {}
+    for client in clients:
+        for event, count in client.events_received.items():
+            events_received[event] = events_received.get(event, 0) + count
+
+    report = {
+        "Generated": datetime.now(timezone.utc).isoformat(),
+        "Parameters": vars(args),
+        "Seconds": round(elapsed, 3),
+        "Sessions": sessions,
+        "Failures": sum(client.failures for client in clients),
+        "Connect_Seconds": summarize([value for client in clients for value in client.connect_seconds]),
+        "Replay_Seconds": summarize([value for client in clients for value in client.replay_seconds]),
+        "Sidebar_Seconds": summarize([value for client in clients for value in client.sidebar_seconds]),
+        "Bytes_Per_Client": summarize(bytes_per_client),
+        "Bytes_Per_Session": round(sum(bytes_per_client) / max(1, sessions)),
+        "Events_Received": events_received,
+    }
+    with open(args.output, "w") as json_file:
+        json.dump(report, json_file, indent=4)
+
+    print(f"Sessions: {sessions}, Failures: {report['Failures']}, Seconds: {report['Seconds']}")
+    print(f"Connect median: {report['Connect_Seconds'].get('Median')}s, Replay median: {report['Replay_Seconds'].get('Median')}s")
+    print(f"Bytes per session: {report['Bytes_Per_Session']}, Events: {events_received}")
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
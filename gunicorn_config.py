@@ -1,5 +1,8 @@
+import os
+
 bind = "0.0.0.0:5000"
-workers = 1
+# More than one worker needs state_backend set to sqlite so workers share state and Socket.IO events
+workers = int(os.environ.get("gunicorn_workers", 1))
 threads = 4
 timeout = 120
 worker_class = "geventwebsocket.gunicorn.workers.GeventWebSocketWorker"
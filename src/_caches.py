@@ -0,0 +1,133 @@
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+class Recommendation_Cache:
+    def __init__(self, logger, db_path, ttl_hours, max_entries):
+        self.diagnostic_logger = logger
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS recommendations (seed TEXT PRIMARY KEY, books TEXT NOT NULL, scraped_at REAL NOT NULL, accessed_at REAL NOT NULL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS idx_recommendations_accessed_at ON recommendations (accessed_at)")
+        self.connection.commit()
+
+    def get(self, seed):
+        try:
+            with self.lock:
+                row = self.connection.execute("SELECT books, scraped_at FROM recommendations WHERE seed = ?", (seed,)).fetchone()
+                if not row:
+                    return None
+                books, scraped_at = row
+                if time.time() - scraped_at > self.ttl_seconds:
+                    return None
+                self.connection.execute("UPDATE recommendations SET accessed_at = ? WHERE seed = ?", (time.time(), seed))
+                self.connection.commit()
+            return json.loads(books)
+
+        except Exception as e:
+            self.diagnostic_logger.error(f"Error reading recommendation cache: {str(e)}")
+            return None
+
+    def put(self, seed, books):
+        try:
+            now = time.time()
+            with self.lock:
+                self.connection.execute("INSERT OR REPLACE INTO recommendations (seed, books, scraped_at, accessed_at) VALUES (?, ?, ?, ?)", (seed, json.dumps(books), now, now))
+                self._evict()
+                self.connection.commit()
+
+        except Exception as e:
+            self.diagnostic_logger.error(f"Error writing recommendation cache: {str(e)}")
+
+    def _evict(self):
+        self.connection.execute("DELETE FROM recommendations WHERE scraped_at < ?", (time.time() - self.ttl_seconds,))
+        count = self.connection.execute("SELECT COUNT(*) FROM recommendations").fetchone()[0]
+        if count > self.max_entries:
+            self.connection.execute("DELETE FROM recommendations WHERE seed IN (SELECT seed FROM recommendations ORDER BY accessed_at ASC LIMIT ?)", (count - self.max_entries,))
+
+
+class Book_Link_Cache:
+    def __init__(self, logger, db_path):
+        self.diagnostic_logger = logger
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS book_links (query TEXT PRIMARY KEY, link TEXT NOT NULL, resolved_at REAL NOT NULL)")
+        self.connection.commit()
+
+    def get(self, query):
+        try:
+            with self.lock:
+                row = self.connection.execute("SELECT link FROM book_links WHERE query = ?", (query,)).fetchone()
+            return row[0] if row else None
+
+        except Exception as e:
+            self.diagnostic_logger.error(f"Error reading book link cache: {str(e)}")
+            return None
+
+    def put(self, query, link):
+        try:
+            with self.lock:
+                self.connection.execute("INSERT OR REPLACE INTO book_links (query, link, resolved_at) VALUES (?, ?, ?)", (query, link, time.time()))
+                self.connection.commit()
+
+        except Exception as e:
+            self.diagnostic_logger.error(f"Error writing book link cache: {str(e)}")
+
+
+class Google_Books_Cache:
+    def __init__(self, logger, db_path, ttl_hours, max_memory_entries):
+        self.diagnostic_logger = logger
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_memory_entries = max_memory_entries
+        self.memory_cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS volumes (query TEXT PRIMARY KEY, volume_info TEXT NOT NULL, fetched_at REAL NOT NULL)")
+        self.connection.commit()
+
+    def get(self, query):
+        try:
+            with self.lock:
+                if query in self.memory_cache:
+                    volume_info, fetched_at = self.memory_cache[query]
+                    if time.time() - fetched_at <= self.ttl_seconds:
+                        self.memory_cache.move_to_end(query)
+                        return volume_info
+                    del self.memory_cache[query]
+
+                row = self.connection.execute("SELECT volume_info, fetched_at FROM volumes WHERE query = ?", (query,)).fetchone()
+                if not row or time.time() - row[1] > self.ttl_seconds:
+                    return None
+                volume_info = json.loads(row[0])
+                self._remember(query, volume_info, row[1])
+            return volume_info
+
+        except Exception as e:
+            self.diagnostic_logger.error(f"Error reading Google Books cache: {str(e)}")
+            return None
+
+    def put(self, query, volume_info):
+        try:
+            fetched_at = time.time()
+            with self.lock:
+                self._remember(query, volume_info, fetched_at)
+                self.connection.execute("INSERT OR REPLACE INTO volumes (query, volume_info, fetched_at) VALUES (?, ?, ?)", (query, json.dumps(volume_info), fetched_at))
+                self.connection.execute("DELETE FROM volumes WHERE fetched_at < ?", (fetched_at - self.ttl_seconds,))
+                self.connection.commit()
+
+        except Exception as e:
+            self.diagnostic_logger.error(f"Error writing Google Books cache: {str(e)}")
+
+    def _remember(self, query, volume_info, fetched_at):
+        self.memory_cache[query] = (volume_info, fetched_at)
+        self.memory_cache.move_to_end(query)
+        while len(self.memory_cache) > self.max_memory_entries:
+            self.memory_cache.popitem(last=False)
@@ -0,0 +1,141 @@
+import os
+import json
+import math
+import time
+import heapq
+import itertools
+import threading
+
+
+class Crawl_Scheduler:
+    def __init__(self, logger, state_file, max_depth, max_frontier=10000):
+        self.diagnostic_logger = logger
+        self.state_file = state_file
+        self.max_depth = max_depth
+        self.max_frontier = max_frontier
+        self.lock = threading.Lock()
+        self.counter = itertools.count()
+        self.root_seeds = []
+        self.frontier = []
+        self.queued = set()
+        self.in_flight = {}
+        self.visited = set()
+        self.seed_stats = {}
+        self.stats_version = 0
+        self.load()
+
+    def start(self, seeds, resume=False):
+        with self.lock:
+            if resume and self.root_seeds and set(seeds) == set(self.root_seeds) and self.frontier:
+                self.diagnostic_logger.info(f"Resuming crawl with {len(self.frontier)} queued and {len(self.visited)} visited books")
+                return
+            self.root_seeds = list(seeds)
+            self.frontier = []
+            self.queued = set()
+            self.in_flight = {}
+            self.visited = set()
+            for seed in seeds:
+                self._push(seed, 0, self._seed_score(seed))
+        self.save()
+
+    def _push(self, query, depth, priority):
+        if query in self.visited or query in self.queued or len(self.frontier) >= self.max_frontier:
+            return
+        self.queued.add(query)
+        heapq.heappush(self.frontier, (-priority, next(self.counter), query, depth))
+
+    def next_batch(self, count):
+        # Seeds stay queued until their yield is recorded, so a stopped or failed scrape can be put back
+        batch = []
+        with self.lock:
+            while self.frontier and len(batch) < count:
+                negative_priority, _, query, depth = heapq.heappop(self.frontier)
+                if query in self.visited:
+                    self.queued.discard(query)
+                    continue
+                self.in_flight[query] = (-negative_priority, depth)
+                batch.append((query, depth))
+        return batch
+
+    def requeue_unfinished(self):
+        with self.lock:
+            in_flight = self.in_flight
+            self.in_flight = {}
+            for query, (priority, depth) in in_flight.items():
+                self.queued.discard(query)
+                self._push(query, depth, priority)
+        if in_flight:
+            self.diagnostic_logger.info(f"Requeued {len(in_flight)} unfinished books")
+
+    def expand(self, queries, parent_depth):
+        depth = parent_depth + 1
+        if depth > self.max_depth:
+            return
+        with self.lock:
+            for query in queries:
+                self._push(query, depth, 0.5**depth * self._seed_score(query))
+
+    def _seed_score(self, query):
+        stats = self.seed_stats.get(query)
+        if not stats or not stats["scrapes"]:
+            return 2.0
+        total_scrapes = sum(seed["scrapes"] for seed in self.seed_stats.values())
+        mean_yield = stats["accepted"] / max(1, stats["returned"])
+        return mean_yield + math.sqrt(2 * math.log(max(1, total_scrapes)) / stats["scrapes"]) / 2
+
+    def record_yield(self, query, returned, accepted):
+        with self.lock:
+            self.in_flight.pop(query, None)
+            self.queued.discard(query)
+            self.visited.add(query)
+            stats = self.seed_stats.setdefault(query, {"last_scraped": None, "scrapes": 0, "returned": 0, "accepted": 0})
+            stats["last_scraped"] = time.time()
+            stats["scrapes"] += 1
+            stats["returned"] += returned
+            stats["accepted"] += accepted
+            self.stats_version += 1
+
+    def get_seed_stats(self, query):
+        with self.lock:
+            stats = self.seed_stats.get(query)
+            return dict(stats) if stats else None
+
+    def is_exhausted(self):
+        with self.lock:
+            return not self.frontier and not self.in_flight
+
+    def save(self):
+        try:
+            with self.lock:
+                state = {
+                    "root_seeds": self.root_seeds,
+                    "frontier": [[-negative_priority, query, depth] for negative_priority, _, query, depth in sorted(self.frontier)] + [[priority, query, depth] for query, (priority, depth) in self.in_flight.items()],
+                    "visited": sorted(self.visited),
+                    "seed_stats": self.seed_stats,
+                }
+            temp_file = f"{self.state_file}.tmp"
+            with open(temp_file, "w") as json_file:
+                json.dump(state, json_file)
+            os.replace(temp_file, self.state_file)
+
+        except Exception as e:
+            self.diagnostic_logger.error(f"Error Saving Crawl State: {str(e)}")
+
+    def load(self):
+        try:
+            if not os.path.exists(self.state_file):
+                return
+            with open(self.state_file, "r") as json_file:
+                state = json.load(json_file)
+            with self.lock:
+                self.root_seeds = state.get("root_seeds", [])
+                self.visited = set(state.get("visited", []))
+                self.seed_stats = state.get("seed_stats", {})
+                self.frontier = []
+                self.queued = set()
+                for priority, query, depth in state.get("frontier", []):
+                    self._push(query, depth, priority)
+            self.diagnostic_logger.info(f"Loaded crawl state with {len(self.frontier)} queued and {len(self.visited)} visited books")
+
+        except Exception as e:
+            self.diagnostic_logger.error(f"Error Loading Crawl State: {str(e)}")
@@ -0,0 +1,83 @@
+import re
+import threading
+from collections import defaultdict
+from thefuzz import fuzz, process
+from unidecode import unidecode
+
+
+STOP_WORDS = {"the", "and", "for", "with", "from", "book", "novel", "series", "volume", "vol"}
+
+
+def normalize_text(text):
+    text = unidecode(text or "").lower()
+    text = re.sub(r"[^a-z0-9]+", " ", text)
+    return " ".join(text.split())
+
+
+class Dedup_Index:
+    def __init__(self, match_threshold=95, block_tokens=2):
+        self.match_threshold = match_threshold
+        self.block_tokens = block_tokens
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.exact_keys = {}
+            self.entries = []
+            self.author_buckets = defaultdict(list)
+            self.token_buckets = defaultdict(list)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _title_tokens(self, title):
+        return {token for token in normalize_text(title).split() if len(token) > 2 and token not in STOP_WORDS}
+
+    def _candidate_ids(self, author_key, title_tokens):
+        candidate_ids = set(self.author_buckets.get(author_key, []))
+        rarest_tokens = sorted(title_tokens, key=lambda token: len(self.token_buckets.get(token, [])))[: self.block_tokens]
+        for token in rarest_tokens:
+            candidate_ids.update(self.token_buckets.get(token, []))
+        return candidate_ids
+
+    def contains(self, author, title):
+        with self.lock:
+            return self._find(author, title) is not None
+
+    def _find(self, author, title):
+        author_key = normalize_text(author)
+        exact_key = f"{author_key} - {normalize_text(title)}"
+        if exact_key in self.exact_keys:
+            return self.exact_keys[exact_key]
+
+        candidate_ids = self._candidate_ids(author_key, self._title_tokens(title))
+        if not candidate_ids:
+            return None
+        candidates = {entry_id: self.entries[entry_id] for entry_id in candidate_ids}
+        match = process.extractOne(f"{author} - {title}", candidates, scorer=fuzz.ratio, score_cutoff=self.match_threshold + 1)
+        return match[2] if match else None
+
+    def add(self, author, title):
+        with self.lock:
+            return self._add(author, title)
+
+    def _add(self, author, title):
+        author_key = normalize_text(author)
+        entry_id = len(self.entries)
+        self.entries.append(f"{author} - {title}")
+        self.exact_keys[f"{author_key} - {normalize_text(title)}"] = entry_id
+        self.author_buckets[author_key].append(entry_id)
+        for token in self._title_tokens(title):
+            self.token_buckets[token].append(entry_id)
+        return entry_id
+
+    def add_if_new(self, author, title):
+        return self.match_or_add(author, title)[1]
+
+    def match_or_add(self, author, title):
+        with self.lock:
+            entry_id = self._find(author, title)
+            if entry_id is not None:
+                return entry_id, False
+            return self._add(author, title), True
@@ -0,0 +1,148 @@
+import random
+import platform
+import threading
+from selenium import webdriver
+from selenium.webdriver.firefox.service import Service as FireFoxService
+from webdriver_manager.firefox import GeckoDriverManager
+
+
+class Driver_Pool:
+    def __init__(self, logger, user_agents, browser_arguments, max_drivers, max_pages_per_driver, memory_governor=None):
+        self.diagnostic_logger = logger
+        self.user_agents = user_agents
+        self.browser_arguments = browser_arguments
+        self.max_drivers = max(1, max_drivers)
+        self.max_pages_per_driver = max_pages_per_driver
+        self.condition = threading.Condition()
+        self.idle_drivers = []
+        self.page_counts = {}
+        self.driver_pids = {}
+        self.memory_governor = memory_governor
+        self.memory_waits = 0
+        self.total_drivers = 0
+        self.hits = 0
+        self.misses = 0
+        self.recycled = 0
+        self.geckodriver_path = None
+        self.geckodriver_lock = threading.Lock()
+
+    def _create_driver(self):
+        firexfox_options = webdriver.FirefoxOptions()
+        for argument in self.browser_arguments:
+            firexfox_options.add_argument(argument)
+        firexfox_options.set_preference("general.useragent.override", random.choice(self.user_agents))
+        if "linux" in platform.platform().lower():
+            with self.geckodriver_lock:
+                if not self.geckodriver_path:
+                    self.geckodriver_path = GeckoDriverManager().install()
+            return webdriver.Firefox(options=firexfox_options, service=FireFoxService(self.geckodriver_path))
+        else:
+            return webdriver.Firefox(options=firexfox_options)
+
+    def acquire(self):
+        measured = False
+        while True:
+            with self.condition:
+                if self.idle_drivers:
+                    self.hits += 1
+                    return self.idle_drivers.pop()
+                if self.total_drivers >= self.max_drivers:
+                    measured = False
+                    self.condition.wait()
+                    continue
+                pending_drivers = self.total_drivers - len(self.driver_pids)
+                if self.memory_governor is None or measured and self.memory_governor.can_admit(admission, pending_drivers):
+                    self.total_drivers += 1
+                    self.misses += 1
+                    break
+                if measured:
+                    # Memory can free up without a release, so check the budget again periodically
+                    self.memory_waits += 1
+                    self.diagnostic_logger.info(f"Browser memory budget reached, waiting for a browser to become available...")
+                    self.condition.wait(5)
+                driver_pids = dict(self.driver_pids)
+            # Measuring walks /proc, so it runs outside the lock and only the comparison happens under it
+            admission = self.memory_governor.measure_admission(driver_pids)
+            measured = True
+
+        try:
+            self.diagnostic_logger.info(f"Creating New Driver...")
+            driver = self._create_driver()
+            with self.condition:
+                self.page_counts[id(driver)] = 0
+                self.driver_pids[id(driver)] = self._driver_pid(driver)
+            return driver
+
+        except Exception:
+            with self.condition:
+                self.total_drivers -= 1
+                self.condition.notify()
+            raise
+
+    def _driver_pid(self, driver):
+        try:
+            return driver.service.process.pid
+        except Exception:
+            return None
+
+    def load_page(self, driver, url):
+        with self.condition:
+            self.page_counts[id(driver)] = self.page_counts.get(id(driver), 0) + 1
+        driver.get(url)
+
+    def release(self, driver):
+        over_ceiling = self.memory_governor is not None and self.memory_governor.is_over_ceiling(self.driver_pids.get(id(driver)))
+        healthy = self.page_counts.get(id(driver), 0) < self.max_pages_per_driver and not over_ceiling and self._reset_driver(driver)
+        with self.condition:
+            if healthy:
+                self.idle_drivers.append(driver)
+            else:
+                self.page_counts.pop(id(driver), None)
+                self.driver_pids.pop(id(driver), None)
+                self.total_drivers -= 1
+                self.recycled += 1
+            self.condition.notify()
+
+        if not healthy:
+            self._quit_driver(driver)
+
+    def _reset_driver(self, driver):
+        try:
+            driver.delete_all_cookies()
+            driver.execute_script("try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}")
+            driver.get("about:blank")
+            return True
+
+        except Exception as e:
+            self.diagnostic_logger.error(f"Driver failed to reset, recycling it: {str(e)}")
+            return False
+
+    def _quit_driver(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            self.diagnostic_logger.error(f"Failed to quit driver: {str(e)}")
+
+    def close(self):
+        with self.condition:
+            idle_drivers = self.idle_drivers
+            self.idle_drivers = []
+            self.total_drivers -= len(idle_drivers)
+            for driver in idle_drivers:
+                self.page_counts.pop(id(driver), None)
+                self.driver_pids.pop(id(driver), None)
+        for driver in idle_drivers:
+            self._quit_driver(driver)
+
+    def get_counts(self):
+        with self.condition:
+            return {"Active": self.total_drivers - len(self.idle_drivers), "Idle": len(self.idle_drivers)}
+
+    def get_stats(self):
+        with self.condition:
+            stats = {"Hits": self.hits, "Misses": self.misses, "Recycled": self.recycled, "Active": self.total_drivers - len(self.idle_drivers), "Idle": len(self.idle_drivers), "Memory_Waits": self.memory_waits}
+            driver_pids = dict(self.driver_pids)
+        if self.memory_governor:
+            self.memory_governor.measure(driver_pids)
+            stats.update(self.memory_governor.get_stats())
+        return stats
@@ -0,0 +1,61 @@
+import json
+import time
+import threading
+
+
+class Emission_Buffer:
+    def __init__(self, socketio, event, max_items=20, max_delay=0.5):
+        self.socketio = socketio
+        self.event = event
+        self.max_items = max_items
+        self.max_delay = max_delay
+        self.lock = threading.Lock()
+        self.pending_items = []
+        self.flush_timer = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.lock:
+            self.frames_sent = 0
+            self.bytes_sent = 0
+            self.items_sent = 0
+            self.started_at = time.monotonic()
+
+    def add(self, item):
+        with self.lock:
+            self.pending_items.append(item)
+            if len(self.pending_items) >= self.max_items:
+                items = self._take_pending()
+            else:
+                items = None
+                if not self.flush_timer:
+                    self.flush_timer = threading.Timer(self.max_delay, self.flush)
+                    self.flush_timer.daemon = True
+                    self.flush_timer.start()
+        if items:
+            self._send(items)
+
+    def flush(self):
+        with self.lock:
+            items = self._take_pending()
+        if items:
+            self._send(items)
+
+    def _take_pending(self):
+        if self.flush_timer:
+            self.flush_timer.cancel()
+            self.flush_timer = None
+        items = self.pending_items
+        self.pending_items = []
+        return items
+
+    def _send(self, items):
+        self.socketio.emit(self.event, items)
+        with self.lock:
+            self.frames_sent += 1
+            self.items_sent += len(items)
+            self.bytes_sent += len(json.dumps(items))
+
+    def get_stats(self):
+        with self.lock:
+            return {"Items": self.items_sent, "Frames": self.frames_sent, "Bytes": self.bytes_sent, "Seconds": round(time.monotonic() - self.started_at, 2)}
@@ -0,0 +1,137 @@
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from collections import OrderedDict
+import requests
+from requests.adapters import HTTPAdapter
+import _metrics
+
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+
+
+class Http_Client:
+    def __init__(self, logger, pool_size=10, max_retries=3, backoff_factor=0.5, max_etag_entries=256, max_etag_bytes=8 * 1024 * 1024, max_retry_wait=60):
+        self.diagnostic_logger = logger
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_retry_wait = max_retry_wait
+        self.max_etag_entries = max_etag_entries
+        self.max_etag_bytes = max_etag_bytes
+        self.etag_cache_bytes = 0
+        self.lock = threading.Lock()
+        self.sessions = {}
+        self.timeouts = {}
+        self.etag_cache = OrderedDict()
+        self.latency_histograms = {}
+
+    def configure_endpoint(self, name, timeout):
+        with self.lock:
+            self.timeouts[name] = timeout
+
+    def _get_session(self, name):
+        with self.lock:
+            if name not in self.sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update({"Accept-Encoding": "gzip, deflate"})
+                self.sessions[name] = session
+                self.latency_histograms[name] = _metrics.Histogram()
+            return self.sessions[name]
+
+    def request(self, name, method, url, conditional=False, **kwargs):
+        session = self._get_session(name)
+        kwargs.setdefault("timeout", self.timeouts.get(name))
+        max_wait = min(self.max_retry_wait, kwargs["timeout"] or self.max_retry_wait)
+        method = method.upper()
+        cache_key = None
+        if conditional and method == "GET":
+            cache_key = requests.Request(method, url, params=kwargs.get("params")).prepare().url
+            with self.lock:
+                cached = self.etag_cache.get(cache_key)
+            if cached:
+                kwargs["headers"] = {**kwargs.get("headers", {}), "If-None-Match": cached[0]}
+
+        attempt = 0
+        while True:
+            start = time.monotonic()
+            try:
+                response = session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.latency_histograms[name].observe(time.monotonic() - start)
+                if attempt >= self.max_retries or method not in IDEMPOTENT_METHODS:
+                    raise
+                self.diagnostic_logger.warning(f"{name} request failed ({str(e)}), retrying...")
+                time.sleep(self._retry_delay(attempt, None))
+                attempt += 1
+                continue
+
+            self.latency_histograms[name].observe(time.monotonic() - start)
+            retryable = response.status_code in RETRY_STATUS_CODES and (method in IDEMPOTENT_METHODS or response.status_code == 429)
+            if retryable and attempt < self.max_retries:
+                delay = self._retry_delay(attempt, response.headers.get("Retry-After"))
+                if delay > max_wait:
+                    # Waiting that long would hold up the caller, so the error response is returned instead
+                    self.diagnostic_logger.warning(f"{name} request returned {response.status_code} and asked to wait {delay:.0f}s, giving up")
+                    break
+                self.diagnostic_logger.warning(f"{name} request returned {response.status_code}, retrying in {delay:.1f}s...")
+                response.close()
+                time.sleep(delay)
+                attempt += 1
+                continue
+            break
+
+        if cache_key:
+            if response.status_code == 304 and cached:
+                with self.lock:
+                    if cache_key in self.etag_cache:
+                        self.etag_cache.move_to_end(cache_key)
+                return cached[1]
+            if response.status_code == 200 and response.headers.get("ETag"):
+                self._remember_etag(cache_key, response)
+        return response
+
+    def _remember_etag(self, cache_key, response):
+        # Cached bodies stay in memory, so a body too large for the byte budget is never kept
+        body_size = len(response.content)
+        with self.lock:
+            self.etag_cache_bytes -= self.etag_cache.pop(cache_key, (None, None, 0))[2]
+            if body_size > self.max_etag_bytes:
+                return
+            self.etag_cache[cache_key] = (response.headers["ETag"], response, body_size)
+            self.etag_cache_bytes += body_size
+            while len(self.etag_cache) > self.max_etag_entries or self.etag_cache_bytes > self.max_etag_bytes:
+                self.etag_cache_bytes -= self.etag_cache.popitem(last=False)[1][2]
+
+    def _retry_delay(self, attempt, retry_after):
+        # A server supplied Retry-After is used as is, only the computed backoff gets jitter
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+        delay = self.backoff_factor * (2**attempt)
+        return delay + random.uniform(0, delay)
+
+    def get(self, name, url, **kwargs):
+        return self.request(name, "GET", url, **kwargs)
+
+    def put(self, name, url, **kwargs):
+        return self.request(name, "PUT", url, **kwargs)
+
+    def post(self, name, url, **kwargs):
+        return self.request(name, "POST", url, **kwargs)
+
+    def get_latency_histograms(self):
+        with self.lock:
+            histograms = dict(self.latency_histograms)
+        return {name: histogram.snapshot() for name, histogram in histograms.items()}
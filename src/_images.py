@@ -0,0 +1,163 @@
+import io
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from urllib.parse import quote, urlsplit
+from PIL import Image
+
+IMAGE_HOSTS = ("gr-assets.com", "goodreads.com", "media-amazon.com", "ssl-images-amazon.com")
+
+
+def read_image_response(response, max_bytes, chunk_size=65536):
+    # Reads a streamed response, stopping as soon as the limit is passed instead of buffering the whole body
+    try:
+        if response.status_code != 200:
+            raise Exception(f"Cover request returned {response.status_code}")
+        if int(response.headers.get("Content-Length") or 0) > max_bytes:
+            raise Exception(f"Cover is too large: {response.headers['Content-Length']} bytes")
+        image_data = bytearray()
+        for chunk in response.iter_content(chunk_size):
+            image_data += chunk
+            if len(image_data) > max_bytes:
+                raise Exception(f"Cover is larger than {max_bytes} bytes")
+        return bytes(image_data)
+    finally:
+        response.close()
+
+
+class Image_Cache:
+    def __init__(self, logger, cache_folder, fetch, max_bytes, thumbnail_size=(240, 360), allowed_hosts=IMAGE_HOSTS, quality=85):
+        self.diagnostic_logger = logger
+        self.cache_folder = os.path.abspath(cache_folder)
+        self.fetch = fetch
+        self.max_bytes = max_bytes
+        self.thumbnail_size = thumbnail_size
+        self.allowed_hosts = allowed_hosts
+        self.quality = quality
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.key_locks = {}
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_folder, exist_ok=True)
+        self._load_existing()
+
+    def _load_existing(self):
+        cached_files = []
+        for file_name in os.listdir(self.cache_folder):
+            file_path = os.path.join(self.cache_folder, file_name)
+            try:
+                if file_name.endswith(".tmp"):
+                    os.remove(file_path)
+                elif file_name.endswith(".jpg"):
+                    file_stat = os.stat(file_path)
+                    cached_files.append((file_stat.st_mtime, file_name[:-4], file_stat.st_size))
+            except OSError:
+                continue
+
+        with self.lock:
+            for _, key, size in sorted(cached_files):
+                self.entries[key] = size
+                self.total_bytes += size
+            self._evict()
+        self.diagnostic_logger.info(f"Image cache: {len(self.entries)} covers, {self.total_bytes / (1024 * 1024):.1f}MB")
+
+    def _path(self, key):
+        return os.path.join(self.cache_folder, f"{key}.jpg")
+
+    def is_allowed(self, url):
+        parts = urlsplit(url or "")
+        host = (parts.hostname or "").lower()
+        return parts.scheme in ("http", "https") and any(host == allowed or host.endswith(f".{allowed}") for allowed in self.allowed_hosts)
+
+    def cache_key(self, url):
+        return hashlib.sha256(f"{self.thumbnail_size[0]}x{self.thumbnail_size[1]}:{url}".encode("utf-8")).hexdigest()[:32]
+
+    def proxy_link(self, url):
+        if not self.is_allowed(url):
+            return url
+        return f"cover?url={quote(url, safe='')}"
+
+    def get(self, url):
+        if not self.is_allowed(url):
+            raise ValueError(f"Image host not allowed: {url}")
+        key = self.cache_key(url)
+        image_path = self._path(key)
+        if self._lookup(key, image_path):
+            return image_path, key
+
+        with self.lock:
+            key_lock = self.key_locks.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                if self._lookup(key, image_path):
+                    return image_path, key
+                thumbnail = self.make_thumbnail(self.fetch(url))
+                temporary_path = f"{image_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(temporary_path, "wb") as image_file:
+                    image_file.write(thumbnail)
+                os.replace(temporary_path, image_path)
+                with self.lock:
+                    self.misses += 1
+                    self._remember(key, len(thumbnail))
+                    self._evict()
+        finally:
+            with self.lock:
+                self.key_locks.pop(key, None)
+        return image_path, key
+
+    def _lookup(self, key, image_path):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                found = True
+            else:
+                found = False
+        if not found:
+            # Another worker may have cached it in the shared folder
+            try:
+                size = os.path.getsize(image_path)
+            except OSError:
+                return False
+            with self.lock:
+                self.hits += 1
+                self._remember(key, size)
+                self._evict()
+            return True
+
+        try:
+            os.utime(image_path)
+            return True
+        except OSError:
+            with self.lock:
+                self.total_bytes -= self.entries.pop(key, 0)
+            return False
+
+    def _remember(self, key, size):
+        self.total_bytes += size - self.entries.get(key, 0)
+        self.entries[key] = size
+        self.entries.move_to_end(key)
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            key, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def make_thumbnail(self, image_data):
+        with Image.open(io.BytesIO(image_data)) as image:
+            thumbnail = image.convert("RGB")
+        thumbnail.thumbnail(self.thumbnail_size, Image.Resampling.LANCZOS)
+        output = io.BytesIO()
+        thumbnail.save(output, "JPEG", quality=self.quality, optimize=True, progressive=True)
+        return output.getvalue()
+
+    def get_stats(self):
+        with self.lock:
+            return {"Covers": len(self.entries), "Megabytes": round(self.total_bytes / (1024 * 1024), 1), "Hits": self.hits, "Misses": self.misses}
@@ -0,0 +1,59 @@
+import time
+import threading
+from collections import defaultdict
+from thefuzz import fuzz
+from _dedup import normalize_text
+
+
+class Library_Index:
+    def __init__(self, title_match_threshold=90):
+        self.title_match_threshold = title_match_threshold
+        self.lock = threading.Lock()
+        self.book_keys = set()
+        self.author_titles = {}
+        self.added_books = []
+
+    def __len__(self):
+        return len(self.book_keys)
+
+    def _build(self, books):
+        book_keys = set()
+        author_titles = defaultdict(list)
+        for book in books:
+            author_key = normalize_text(book["author"])
+            title_key = normalize_text(book["title"])
+            book_keys.add(f"{author_key} - {title_key}")
+            author_titles[author_key].append(title_key)
+        return book_keys, dict(author_titles)
+
+    def rebuild(self, books, synced_at):
+        book_keys, author_titles = self._build(books)
+        with self.lock:
+            # Only adds made after the sync started and not yet in its results are still needed
+            self.added_books = [book for book in self.added_books if book["added_at"] > synced_at and f"{normalize_text(book['author'])} - {normalize_text(book['title'])}" not in book_keys]
+            late_keys, late_titles = self._build(self.added_books)
+            book_keys.update(late_keys)
+            for author_key, titles in late_titles.items():
+                author_titles.setdefault(author_key, []).extend(titles)
+            self.book_keys = book_keys
+            self.author_titles = author_titles
+
+    def add(self, author, title):
+        author_key = normalize_text(author)
+        title_key = normalize_text(title)
+        with self.lock:
+            self.added_books.append({"author": author, "title": title, "added_at": time.time()})
+            self.book_keys.add(f"{author_key} - {title_key}")
+            self.author_titles.setdefault(author_key, []).append(title_key)
+
+    def contains(self, author, title, fuzzy=True):
+        author_key = normalize_text(author)
+        title_key = normalize_text(title)
+        with self.lock:
+            if f"{author_key} - {title_key}" in self.book_keys:
+                return True
+            author_titles = list(self.author_titles.get(author_key, []))
+
+        if fuzzy:
+            return any(fuzz.ratio(title_key, existing_title) > self.title_match_threshold for existing_title in author_titles)
+        return False
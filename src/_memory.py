@@ -0,0 +1,166 @@
+import os
+import threading
+
+MEGABYTE = 1024 * 1024
+
+
+def read_meminfo():
+    meminfo = {}
+    try:
+        with open("/proc/meminfo", "r") as meminfo_file:
+            for line in meminfo_file:
+                key, value = line.split(":", 1)
+                meminfo[key] = int(value.split()[0]) * 1024
+    except (OSError, ValueError):
+        pass
+    return meminfo
+
+
+def read_int_file(path):
+    try:
+        with open(path, "r") as value_file:
+            value = value_file.read().strip()
+        return None if value == "max" else int(value)
+    except (OSError, ValueError):
+        return None
+
+
+def read_cgroup_memory():
+    # cgroup v2 first, then v1, v1 reports "no limit" as a huge number
+    limit = read_int_file("/sys/fs/cgroup/memory.max")
+    usage = read_int_file("/sys/fs/cgroup/memory.current")
+    if limit is None and usage is None:
+        limit = read_int_file("/sys/fs/cgroup/memory/memory.limit_in_bytes")
+        usage = read_int_file("/sys/fs/cgroup/memory/memory.usage_in_bytes")
+        if limit is not None and limit >= 1 << 60:
+            limit = None
+    return limit, usage
+
+
+def read_process_children():
+    children = {}
+    try:
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat", "r") as stat_file:
+                    stat = stat_file.read()
+                parent_pid = int(stat[stat.rindex(")") + 2 :].split()[1])
+                children.setdefault(parent_pid, []).append(int(entry))
+            except (OSError, ValueError):
+                continue
+    except OSError:
+        return None
+    return children
+
+
+def read_process_tree_rss(root_pid, children=None):
+    if children is None:
+        children = read_process_children()
+        if children is None:
+            return None
+
+    total_rss = 0
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    pending_pids = [root_pid]
+    while pending_pids:
+        pid = pending_pids.pop()
+        try:
+            with open(f"/proc/{pid}/statm", "r") as statm_file:
+                total_rss += int(statm_file.read().split()[1]) * page_size
+        except (OSError, ValueError):
+            continue
+        pending_pids.extend(children.get(pid, []))
+    return total_rss
+
+
+class Memory_Governor:
+    def __init__(self, logger, budget_mb=0, ceiling_mb=1024, estimate_mb=350, budget_fraction=0.75):
+        self.diagnostic_logger = logger
+        self.ceiling = ceiling_mb * MEGABYTE if ceiling_mb else None
+        self.default_estimate = estimate_mb * MEGABYTE
+        self.lock = threading.Lock()
+        self.enabled = os.path.exists("/proc/meminfo")
+        self.browser_usage = {}
+        self.peak_usage = 0
+        self.peak_browser_usage = 0
+
+        cgroup_limit, _ = read_cgroup_memory()
+        total_memory = cgroup_limit or read_meminfo().get("MemTotal")
+        if budget_mb:
+            self.budget = budget_mb * MEGABYTE
+        elif total_memory:
+            self.budget = int(total_memory * budget_fraction)
+        else:
+            self.budget = None
+        if self.enabled:
+            self.diagnostic_logger.info(f"Browser memory budget: {self._format(self.budget)}, per browser ceiling: {self._format(self.ceiling)}")
+
+    def _format(self, value):
+        return "unlimited" if value is None else f"{value / MEGABYTE:.0f}MB"
+
+    def available_memory(self):
+        available = read_meminfo().get("MemAvailable")
+        cgroup_limit, cgroup_usage = read_cgroup_memory()
+        if cgroup_limit is not None and cgroup_usage is not None:
+            cgroup_available = max(0, cgroup_limit - cgroup_usage)
+            available = cgroup_available if available is None else min(available, cgroup_available)
+        return available
+
+    def measure(self, browser_pids):
+        if not self.enabled:
+            return {}
+        usage = {}
+        # One walk of /proc serves every browser
+        children = read_process_children() if browser_pids else None
+        if children is None:
+            browser_pids = {}
+        for key, pid in browser_pids.items():
+            rss = read_process_tree_rss(pid, children) if pid else None
+            if rss is not None:
+                usage[key] = rss
+        with self.lock:
+            self.browser_usage = usage
+            total_usage = sum(usage.values())
+            self.peak_usage = max(self.peak_usage, total_usage)
+            self.peak_browser_usage = max([self.peak_browser_usage] + list(usage.values()))
+        return usage
+
+    def estimate_per_browser(self):
+        with self.lock:
+            if self.browser_usage:
+                return max(self.default_estimate, sum(self.browser_usage.values()) // len(self.browser_usage))
+            return self.default_estimate
+
+    def measure_admission(self, browser_pids):
+        # Reads /proc, so callers take this outside their own locks and only compare under them
+        if not self.enabled:
+            return None
+        return {"usage": sum(self.measure(browser_pids).values()), "browsers": len(browser_pids), "available": self.available_memory()}
+
+    def can_admit(self, admission, pending_browsers=0):
+        if admission is None or (not admission["browsers"] and not pending_browsers):
+            return True
+        estimate = self.estimate_per_browser()
+        if self.budget is not None and admission["usage"] + estimate * (pending_browsers + 1) > self.budget:
+            return False
+        return admission["available"] is None or admission["available"] > estimate
+
+    def is_over_ceiling(self, pid):
+        if not self.enabled or not self.ceiling or not pid:
+            return False
+        rss = read_process_tree_rss(pid)
+        if rss is not None and rss > self.ceiling:
+            self.diagnostic_logger.warning(f"Browser using {self._format(rss)} exceeds the {self._format(self.ceiling)} ceiling, replacing it")
+            return True
+        return False
+
+    def get_stats(self):
+        with self.lock:
+            current_usage = sum(self.browser_usage.values())
+            stats = {"Memory_MB": round(current_usage / MEGABYTE), "Peak_Memory_MB": round(self.peak_usage / MEGABYTE), "Peak_Browser_MB": round(self.peak_browser_usage / MEGABYTE)}
+        available = self.available_memory() if self.enabled else None
+        stats["Available_MB"] = None if available is None else round(available / MEGABYTE)
+        stats["Budget_MB"] = None if self.budget is None else round(self.budget / MEGABYTE)
+        return stats
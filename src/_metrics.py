@@ -0,0 +1,119 @@
+import time
+import bisect
+import threading
+
+
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.lock = threading.Lock()
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        with self.lock:
+            self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.total += value
+            self.count += 1
+
+    def snapshot(self):
+        with self.lock:
+            cumulative_counts = []
+            running_count = 0
+            for bucket_count in self.bucket_counts:
+                running_count += bucket_count
+                cumulative_counts.append(running_count)
+            return {"Buckets": list(self.buckets) + [float("inf")], "Counts": cumulative_counts, "Sum": self.total, "Count": self.count}
+
+
+class Metrics_Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.help_texts = {}
+        self.counters = {}
+        self.histograms = {}
+        self.gauge_sources = {}
+        self.histogram_sources = {}
+
+    def describe(self, name, help_text):
+        self.help_texts[name] = help_text
+
+    def increment(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            histogram = self.histograms[key]
+        histogram.observe(value)
+
+    def observe_since(self, name, start, **labels):
+        self.observe(name, time.monotonic() - start, **labels)
+
+    def register_gauge(self, name, help_text, callback):
+        self.describe(name, help_text)
+        self.gauge_sources[name] = callback
+
+    def register_histogram_source(self, name, help_text, label_name, callback):
+        self.describe(name, help_text)
+        self.histogram_sources[name] = (label_name, callback)
+
+    def _format_labels(self, labels):
+        if not labels:
+            return ""
+        label_text = ",".join(f'{key}="{str(value)}"' for key, value in labels)
+        return f"{{{label_text}}}"
+
+    def _render_histogram(self, lines, name, labels, snapshot):
+        for bucket, count in zip(snapshot["Buckets"], snapshot["Counts"]):
+            bucket_text = "+Inf" if bucket == float("inf") else str(bucket)
+            lines.append(f"{name}_bucket{self._format_labels(labels + (('le', bucket_text),))} {count}")
+        lines.append(f"{name}_sum{self._format_labels(labels)} {snapshot['Sum']}")
+        lines.append(f"{name}_count{self._format_labels(labels)} {snapshot['Count']}")
+
+    def render(self):
+        lines = []
+        with self.lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items(), key=lambda item: item[0])
+
+        rendered_names = set()
+        for (name, labels), value in counters:
+            if name not in rendered_names:
+                rendered_names.add(name)
+                lines.append(f"# HELP {name} {self.help_texts.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{self._format_labels(labels)} {value}")
+
+        for (name, labels), histogram in histograms:
+            if name not in rendered_names:
+                rendered_names.add(name)
+                lines.append(f"# HELP {name} {self.help_texts.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+            self._render_histogram(lines, name, labels, histogram.snapshot())
+
+        for name, (label_name, callback) in self.histogram_sources.items():
+            lines.append(f"# HELP {name} {self.help_texts.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+            for label_value, snapshot in sorted(callback().items()):
+                self._render_histogram(lines, name, ((label_name, label_value),), snapshot)
+
+        for name, callback in self.gauge_sources.items():
+            lines.append(f"# HELP {name} {self.help_texts.get(name, name)}")
+            lines.append(f"# TYPE {name} gauge")
+            value = callback()
+            if isinstance(value, dict):
+                for label_value, gauge_value in sorted(value.items()):
+                    lines.append(f'{name}{{state="{label_value}"}} {gauge_value}')
+            else:
+                lines.append(f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
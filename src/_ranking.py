@@ -0,0 +1,83 @@
+import math
+import heapq
+import threading
+from _scrapers import parse_vote_count
+
+
+class Ranking_Engine:
+    def __init__(self, top_k=100, vote_confidence=500, popularity_weight=0.1, seed_weight=0.5):
+        self.top_k = top_k
+        self.vote_confidence = vote_confidence
+        self.popularity_weight = popularity_weight
+        self.seed_weight = seed_weight
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.candidates = {}
+            self.rating_total = 0.0
+            self.scored_prior = None
+            self.dirty_ids = set()
+            self.top_entries = []
+
+    def _numeric_values(self, book):
+        rating = book.get("Rating_Value")
+        if rating is None:
+            rating = float(str(book.get("Rating", "")).replace("Rating:", "").strip() or 0)
+        votes = book.get("Vote_Count")
+        if votes is None:
+            votes = parse_vote_count(str(book.get("Votes", "")).replace("Votes:", ""))
+        return rating, votes
+
+    def add(self, entry_id, book):
+        with self.lock:
+            candidate = self.candidates.get(entry_id)
+            if candidate:
+                candidate["base_books"].add(book["Base_Book"])
+                candidate["book"]["Recommended_By"] = sorted(candidate["base_books"])
+                self.dirty_ids.add(entry_id)
+                return
+
+            rating, votes = self._numeric_values(book)
+            self.rating_total += rating
+            book["Recommended_By"] = [book["Base_Book"]]
+            self.candidates[entry_id] = {"book": book, "rating": rating, "votes": votes, "base_books": {book["Base_Book"]}, "score": 0.0}
+            self.dirty_ids.add(entry_id)
+
+    def rescore(self):
+        with self.lock:
+            if not self.candidates:
+                self.top_entries = []
+                return []
+            prior_rating = self.rating_total / len(self.candidates)
+            full_rescore = self.scored_prior is None or abs(prior_rating - self.scored_prior) > 0.01
+            entry_ids = list(self.candidates) if full_rescore else list(self.dirty_ids)
+            candidates = [self.candidates[entry_id] for entry_id in entry_ids]
+            ratings = [candidate["rating"] for candidate in candidates]
+            votes = [candidate["votes"] for candidate in candidates]
+            seed_counts = [len(candidate["base_books"]) for candidate in candidates]
+
+            confidence = self.vote_confidence
+            scores = [
+                (vote_count * rating + confidence * prior_rating) / (vote_count + confidence) + self.popularity_weight * math.log10(1 + vote_count) + self.seed_weight * math.log2(seed_count)
+                for rating, vote_count, seed_count in zip(ratings, votes, seed_counts)
+            ]
+            for candidate, score in zip(candidates, scores):
+                candidate["score"] = score
+                candidate["book"]["Score"] = round(score, 3)
+
+            # Scores only rise between full passes, so the previous top-K plus the rescored entries holds the new top-K
+            if full_rescore:
+                self.top_entries = heapq.nlargest(self.top_k, zip(scores, entry_ids))
+            else:
+                retained_entries = [(score, entry_id) for score, entry_id in self.top_entries if entry_id not in self.dirty_ids]
+                self.top_entries = heapq.nlargest(self.top_k, retained_entries + list(zip(scores, entry_ids)))
+            self.scored_prior = prior_rating if full_rescore else self.scored_prior
+            self.dirty_ids = set()
+            return [self.candidates[entry_id]["book"] for _, entry_id in self.top_entries]
+
+    def ranked_summary(self):
+        with self.lock:
+            ranked_books = [self.candidates[entry_id]["book"] for _, entry_id in self.top_entries]
+            return [{"Key": f"{book['Author']} - {book['Name']}", "Score": book["Score"], "Recommended_By": book["Recommended_By"]} for book in ranked_books]
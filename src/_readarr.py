@@ -0,0 +1,189 @@
+import os
+import json
+import time
+import concurrent.futures
+import threading
+from thefuzz import fuzz
+from _dedup import normalize_text
+
+
+def author_marker(author):
+    statistics = author.get("statistics")
+    if not statistics:
+        return None
+    return [statistics.get("bookCount"), statistics.get("bookFileCount"), statistics.get("sizeOnDisk"), author.get("monitored")]
+
+
+def monitored_edition_id(book):
+    # foreignBookId is a GoodReads work, the edition ids are GoodReads book ids
+    editions = book.get("editions") or []
+    edition = next((edition for edition in editions if edition.get("monitored")), editions[0] if editions else None)
+    return edition.get("foreignEditionId") if edition else None
+
+
+class Readarr_Sync:
+    def __init__(self, logger, http_client, pool_size=8):
+        self.diagnostic_logger = logger
+        self.http_client = http_client
+        self.pool_size = pool_size
+        self.phase_timings = {}
+        self.authors = []
+
+    def fetch_library(self, readarr_address, readarr_api_key, readarr_api_timeout, progress_callback=None, snapshot=None):
+        self.phase_timings = {}
+        headers = {"Accept": "application/json", "X-Api-Key": readarr_api_key}
+        sync_start = time.monotonic()
+
+        phase_start = time.monotonic()
+        response_authors = self.http_client.get("readarr", f"{readarr_address}/api/v1/author", headers=headers, timeout=readarr_api_timeout, conditional=True)
+        if response_authors.status_code != 200:
+            raise Exception(f"Failed to fetch authors from Readarr: {response_authors.text}")
+        authors = response_authors.json()
+        self.authors = authors
+        author_names = {author["id"]: author["authorName"] for author in authors}
+        self.phase_timings["authors"] = time.monotonic() - phase_start
+        self._report_progress(progress_callback, 0, len(authors))
+
+        phase_start = time.monotonic()
+        library = []
+        changed_authors = self._changed_authors(authors, snapshot) if snapshot else None
+        if changed_authors is not None and len(changed_authors) < len(authors):
+            self.diagnostic_logger.info(f"Delta sync: {len(changed_authors)} of {len(authors)} authors changed since the last snapshot")
+            changed_ids = {author["id"] for author in changed_authors}
+            library = [book for book in snapshot["library"] if book["author_id"] in author_names and book["author_id"] not in changed_ids]
+            books = self._fetch_books_per_author(readarr_address, headers, readarr_api_timeout, changed_authors, progress_callback)
+            self.phase_timings["books_delta"] = time.monotonic() - phase_start
+        else:
+            books = self._fetch_all_books(readarr_address, headers, readarr_api_timeout)
+            if books is not None:
+                self.phase_timings["books_bulk"] = time.monotonic() - phase_start
+                self._report_progress(progress_callback, len(authors), len(authors))
+            else:
+                self.diagnostic_logger.info(f"Bulk book request unavailable, fetching books for {len(authors)} authors")
+                books = self._fetch_books_per_author(readarr_address, headers, readarr_api_timeout, authors, progress_callback)
+                self.phase_timings["books_per_author"] = time.monotonic() - phase_start
+
+        phase_start = time.monotonic()
+        for book in books:
+            if book.get("statistics", {}).get("bookFileCount", 0) > 0:
+                author_name = author_names.get(book.get("authorId")) or book.get("author", {}).get("authorName")
+                if author_name:
+                    library.append({"author": author_name, "title": book.get("title"), "book_id": book.get("id"), "author_id": book.get("authorId"), "foreign_book_id": book.get("foreignBookId"), "foreign_edition_id": monitored_edition_id(book)})
+        self.phase_timings["process"] = time.monotonic() - phase_start
+        self.phase_timings["total"] = time.monotonic() - sync_start
+
+        timings_text = ", ".join(f"{phase}: {duration:.2f}s" for phase, duration in self.phase_timings.items())
+        self.diagnostic_logger.info(f"Readarr sync of {len(library)} books took {timings_text}")
+        return library
+
+    def _changed_authors(self, authors, snapshot):
+        # Authors without statistics have no reliable marker, so they are always refetched
+        previous_markers = snapshot.get("author_markers", {})
+        return [author for author in authors if author_marker(author) is None or previous_markers.get(str(author["id"])) != author_marker(author)]
+
+    def _fetch_all_books(self, readarr_address, headers, readarr_api_timeout):
+        try:
+            response_books = self.http_client.get("readarr", f"{readarr_address}/api/v1/book", headers=headers, timeout=readarr_api_timeout)
+            if response_books.status_code != 200:
+                raise Exception(f"Status code {response_books.status_code}")
+            books = response_books.json()
+            if not isinstance(books, list):
+                raise Exception("Unexpected response format")
+            return books
+
+        except Exception as e:
+            self.diagnostic_logger.error(f"Bulk book request failed: {str(e)}")
+            return None
+
+    def _fetch_books_per_author(self, readarr_address, headers, readarr_api_timeout, authors, progress_callback):
+        def fetch_author_books(author):
+            endpoint_books = f"{readarr_address}/api/v1/book?authorId={author['id']}"
+            response_books = self.http_client.get("readarr", endpoint_books, headers=headers, timeout=readarr_api_timeout)
+            if response_books.status_code != 200:
+                raise Exception(f"Failed to fetch books by author '{author['authorName']}' from Readarr: {response_books.text}")
+            return response_books.json()
+
+        books = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+            futures = [executor.submit(fetch_author_books, author) for author in authors]
+            for completed, future in enumerate(concurrent.futures.as_completed(futures), start=1):
+                books.extend(future.result())
+                self._report_progress(progress_callback, completed, len(authors))
+        return books
+
+    def _report_progress(self, progress_callback, completed, total):
+        if progress_callback:
+            try:
+                progress_callback(completed, total)
+            except Exception as e:
+                self.diagnostic_logger.error(f"Progress callback error: {str(e)}")
+
+
+class Readarr_Author_Index:
+    def __init__(self, max_age=600, match_threshold=95):
+        self.max_age = max_age
+        self.match_threshold = match_threshold
+        self.lock = threading.Lock()
+        self.authors = {}
+        self.loaded_at = None
+
+    def is_stale(self):
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.max_age
+
+    def load(self, authors):
+        with self.lock:
+            self.authors = {normalize_text(author["authorName"]): author for author in authors}
+            self.loaded_at = time.monotonic()
+
+    def add(self, author):
+        with self.lock:
+            self.authors[normalize_text(author["authorName"])] = author
+
+    def find(self, author_name):
+        with self.lock:
+            author = self.authors.get(normalize_text(author_name))
+            if author:
+                return author
+            authors = list(self.authors.values())
+
+        for author in authors:
+            if fuzz.ratio(author["authorName"], author_name) > self.match_threshold:
+                return author
+        return None
+
+
+class Library_Snapshot:
+    def __init__(self, logger, snapshot_file):
+        self.diagnostic_logger = logger
+        self.snapshot_file = snapshot_file
+        self.data = None
+
+    def load(self):
+        try:
+            if not os.path.exists(self.snapshot_file):
+                return None
+            with open(self.snapshot_file, "r") as json_file:
+                self.data = json.load(json_file)
+            self.diagnostic_logger.info(f"Loaded library snapshot of {len(self.data['library'])} books from {time.ctime(self.data['saved_at'])}")
+
+        except Exception as e:
+            self.diagnostic_logger.error(f"Error Loading Library Snapshot: {str(e)}")
+            self.data = None
+
+        return self.data
+
+    def save(self, library, authors, readarr_address):
+        try:
+            self.data = {
+                "saved_at": time.time(),
+                "readarr_address": readarr_address,
+                "author_markers": {str(author["id"]): author_marker(author) for author in authors},
+                "library": [{**book, "key": f"{normalize_text(book['author'])} - {normalize_text(book['title'])}"} for book in library],
+            }
+            temp_file = f"{self.snapshot_file}.tmp"
+            with open(temp_file, "w") as json_file:
+                json.dump(self.data, json_file)
+            os.replace(temp_file, self.snapshot_file)
+
+        except Exception as e:
+            self.diagnostic_logger.error(f"Error Saving Library Snapshot: {str(e)}")
@@ -0,0 +1,164 @@
+import os
+import json
+import heapq
+import base64
+import threading
+from collections import OrderedDict
+
+SORT_KEYS = {
+    "discovered": lambda book: (book["Id"],),
+    "score": lambda book: (-(book.get("Score") or 0.0), book["Id"]),
+    "rating": lambda book: (-(book.get("Rating_Value") or 0.0), book["Id"]),
+    "votes": lambda book: (-(book.get("Vote_Count") or 0), book["Id"]),
+    "author": lambda book: (book["Author"].lower(), book["Name"].lower(), book["Id"]),
+}
+
+
+def encode_cursor(sort, key, snapshot_id=None):
+    return base64.urlsafe_b64encode(json.dumps({"sort": sort, "after": list(key), "snapshot": snapshot_id}).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor, sort):
+    if not cursor:
+        return None, None
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        after = tuple(data["after"])
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor")
+    if data.get("sort") != sort:
+        raise ValueError("Cursor belongs to a different sort order")
+    return after, data.get("snapshot")
+
+
+def parse_page_query(query, page_size=25, max_page_size=100):
+    sort = query.get("sort") or "score"
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort order: {sort}")
+    try:
+        limit = int(query.get("limit") or page_size)
+        minimum_rating = float(query["minimum_rating"]) if query.get("minimum_rating") not in (None, "") else None
+    except (TypeError, ValueError):
+        raise ValueError("Limit and minimum rating must be numbers")
+    return {
+        "cursor": query.get("cursor") or None,
+        "limit": max(1, min(max_page_size, limit)),
+        "sort": sort,
+        "author": str(query.get("author") or "").strip().lower(),
+        "seed": str(query.get("seed") or "").strip().lower(),
+        "minimum_rating": minimum_rating,
+    }
+
+
+def matches_filters(book, author, seed, minimum_rating):
+    if author and author not in book["Author"].lower():
+        return False
+    if seed and not any(seed in seed_book.lower() for seed_book in book.get("Recommended_By") or [book.get("Base_Book", "")]):
+        return False
+    if minimum_rating is not None and (book.get("Rating_Value") or 0.0) < minimum_rating:
+        return False
+    return True
+
+
+def select_page(books, cursor=None, limit=25, sort="score", author="", seed="", minimum_rating=None, snapshots=None):
+    # Keyset paging, a page continues after the last key served so new discoveries never shift later pages
+    sort_key = SORT_KEYS[sort]
+    after, snapshot_id = decode_cursor(cursor, sort)
+    matches = [book for book in books if matches_filters(book, author, seed, minimum_rating)]
+    frozen_key = None
+    if sort == "score" and snapshots is not None:
+        # Scores change on every rescore, so a listing keeps paging through the order it started with
+        frozen_key = snapshots.get(snapshot_id, matches)
+        if frozen_key:
+            sort_key = frozen_key
+        elif after is not None:
+            # The snapshot was evicted or lives on another worker, so continue from the current scores
+            after = after[-2:]
+    remaining = matches if after is None else [book for book in matches if sort_key(book) > after]
+    page = heapq.nsmallest(limit + 1, remaining, key=sort_key)
+    next_cursor = None
+    if len(page) > limit:
+        if sort == "score" and snapshots is not None and not frozen_key:
+            snapshot_id, frozen_key = snapshots.create(matches)
+            sort_key = frozen_key
+        next_cursor = encode_cursor(sort, sort_key(page[limit - 1]), snapshot_id)
+    return {"Books": page[:limit], "Next_Cursor": next_cursor, "Total": len(matches), "Sort": sort}
+
+
+class Ranking_Snapshots:
+    def __init__(self, max_snapshots=32):
+        self.max_snapshots = max_snapshots
+        self.lock = threading.Lock()
+        self.snapshots = OrderedDict()
+        self.next_id = 0
+
+    def create(self, books):
+        # Only listings that hand out a cursor get a snapshot, a first page on its own never needs one
+        with self.lock:
+            snapshot_id = f"{os.getpid()}-{self.next_id}"
+            self.next_id += 1
+            self.snapshots[snapshot_id] = {"generation": 0, "keys": {}}
+            while len(self.snapshots) > self.max_snapshots:
+                self.snapshots.popitem(last=False)
+            return snapshot_id, self._freeze(self.snapshots[snapshot_id], books)
+
+    def get(self, snapshot_id, books):
+        with self.lock:
+            snapshot = self.snapshots.get(snapshot_id)
+            if snapshot is None:
+                return None
+            self.snapshots.move_to_end(snapshot_id)
+            return self._freeze(snapshot, books)
+
+    def _freeze(self, snapshot, books):
+        # Books discovered later are frozen in a newer generation, which sorts after every key already served
+        frozen_keys = snapshot["keys"]
+        new_books = [book for book in books if book["Id"] not in frozen_keys]
+        if new_books:
+            snapshot["generation"] += 1
+            for book in new_books:
+                frozen_keys[book["Id"]] = (snapshot["generation"], -(book.get("Score") or 0.0), book["Id"])
+        return lambda book: frozen_keys[book["Id"]]
+
+
+class Result_Store:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = 0
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.books = {}
+            self.version += 1
+
+    def __len__(self):
+        return len(self.books)
+
+    def add(self, entry_id, book):
+        book["Id"] = entry_id
+        with self.lock:
+            self.books[entry_id] = book
+            self.version += 1
+
+    def mark_changed(self):
+        with self.lock:
+            self.version += 1
+
+    def get(self, entry_id):
+        with self.lock:
+            return self.books.get(entry_id)
+
+    def find(self, author, name):
+        with self.lock:
+            for book in self.books.values():
+                if book["Name"] == name and book["Author"] == author:
+                    return book
+        return None
+
+    def all(self):
+        with self.lock:
+            return list(self.books.values())
+
+    def page(self, **query):
+        return select_page(self.all(), **query)
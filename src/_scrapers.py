@@ -1,24 +1,186 @@
+import re
+import html
+import json
+import time
 import random
 import platform
-from urllib.parse import urlparse
-from selenium import webdriver
-from selenium.webdriver.firefox.service import Service as FireFoxService
+from html.parser import HTMLParser
+from urllib.parse import urlparse, urljoin, quote_plus
+import requests
+from requests.adapters import HTTPAdapter
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from thefuzz import fuzz
 from pyvirtualdisplay import Display
-from webdriver_manager.firefox import GeckoDriverManager
+import _drivers
+import _throttle
+
+
+GOODREADS_URL = "https://www.goodreads.com"
+
+# Reads every BookCard in one WebDriver round trip, textContent also covers cards scrolled out of view
+CAROUSEL_EXTRACTION_SCRIPT = """
+const read_text = (card, selector) => {
+    const element = card.querySelector(selector);
+    return element ? element.textContent.trim() : "";
+};
+return Array.from(arguments[0].querySelectorAll(".BookCard")).map((card) => {
+    const image = card.querySelector("img.ResponsiveImage");
+    return {
+        title: read_text(card, '[data-testid="title"]'),
+        author: read_text(card, '[data-testid="author"]'),
+        rating: read_text(card, ".AverageRating__ratingValue"),
+        votes: read_text(card, '[data-testid="ratingsCount"]'),
+        image_url: image ? image.currentSrc || image.getAttribute("src") || "" : "",
+    };
+});
+"""
+
+
+# Firefox exposes the HTTP status of the last navigation, the titles cover error pages served with a 200
+NAVIGATION_STATUS_SCRIPT = """
+const entry = performance.getEntriesByType("navigation")[0];
+return entry && entry.responseStatus ? entry.responseStatus : null;
+"""
+THROTTLE_STATUS_CODES = (403, 429, 503)
+THROTTLE_PAGE_TITLES = ("Too Many Requests", "403 Forbidden", "Service Unavailable", "ERROR: The request could not be satisfied", "Robot Check")
+
+
+class Throttled_Page_Error(Exception):
+    pass
+
+
+def parse_vote_count(votes):
+    votes = votes.replace(",", "").strip()
+    if "m" in votes:
+        return int(float(votes.replace("m", "")) * 1000000)
+    elif "k" in votes:
+        return int(float(votes.replace("k", "")) * 1000)
+    else:
+        return int(0 if votes == "" else votes)
+
+
+class Goodreads_Search_Parser(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.results = []
+        self.current_row = None
+        self.span_stack = []
+        self.capture_field = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "tr" and "schema.org/Book" in (attrs.get("itemtype") or ""):
+            self.current_row = {"title": "", "author": "", "link": None}
+        elif self.current_row is None:
+            return
+        elif tag == "a" and "bookTitle" in (attrs.get("class") or "").split():
+            self.current_row["link"] = attrs.get("href")
+        elif tag == "span":
+            itemprop = attrs.get("itemprop")
+            self.span_stack.append(itemprop)
+            if itemprop == "name":
+                self.capture_field = "author" if "author" in self.span_stack else "title"
+                if self.current_row[self.capture_field]:
+                    self.capture_field = None
+
+    def handle_endtag(self, tag):
+        if self.current_row is None:
+            return
+        if tag == "span" and self.span_stack:
+            if self.span_stack.pop() == "name":
+                self.capture_field = None
+        elif tag == "tr":
+            if self.current_row["link"] and self.current_row["title"]:
+                self.current_row["title"] = self.current_row["title"].strip()
+                self.current_row["author"] = self.current_row["author"].strip()
+                self.results.append(self.current_row)
+            self.current_row = None
+            self.span_stack = []
+            self.capture_field = None
+
+    def handle_data(self, data):
+        if self.current_row is not None and self.capture_field:
+            self.current_row[self.capture_field] += data
+
+
+def parse_search_results(html, base_url=GOODREADS_URL):
+    parser = Goodreads_Search_Parser()
+    parser.feed(html)
+    for result in parser.results:
+        result["link"] = urljoin(base_url, result["link"])
+    return parser.results
+
+
+def parse_page_title(page_html):
+    match = re.search(r"<title[^>]*>(.*?)</title>", page_html, re.DOTALL | re.IGNORECASE)
+    return html.unescape(match.group(1)).strip() if match else ""
+
+
+def parse_related_books(page_html):
+    match = re.search(r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>', page_html, re.DOTALL)
+    if not match:
+        return []
+    apollo_state = json.loads(match.group(1)).get("props", {}).get("pageProps", {}).get("apolloState", {})
+    root_query = apollo_state.get("ROOT_QUERY", {})
+
+    def resolve(reference):
+        return apollo_state.get((reference or {}).get("__ref"), {})
+
+    related_books = []
+    for key, value in root_query.items():
+        if not key.startswith("getSimilarBooks"):
+            continue
+        for edge in (value or {}).get("edges", []):
+            book = resolve(edge.get("node"))
+            if not book.get("title"):
+                continue
+            stats = resolve(book.get("work")).get("stats", {})
+            author = resolve((book.get("primaryContributorEdge") or {}).get("node")).get("name", "")
+            related_books.append(
+                {
+                    "title": book.get("title"),
+                    "author": author,
+                    "rating": stats.get("averageRating") or 0.0,
+                    "votes": stats.get("ratingsCount") or 0,
+                    "image_url": book.get("imageUrl"),
+                }
+            )
+    return related_books
+
+
+class Goodreads_Http_Scraper:
+    def __init__(self, logger, user_agents, timeout, pool_size, base_url=GOODREADS_URL):
+        self.diagnostic_logger = logger
+        self.timeout = timeout
+        self.base_url = base_url
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"User-Agent": random.choice(user_agents), "Accept-Language": "en-US,en;q=0.9"})
+
+    def search(self, query):
+        response = self.session.get(f"{self.base_url}/search?q={quote_plus(query)}", timeout=self.timeout)
+        response.raise_for_status()
+        return parse_search_results(response.text, self.base_url)
+
+    def book_page(self, book_link):
+        response = self.session.get(book_link, timeout=self.timeout)
+        response.raise_for_status()
+        return {"title": parse_page_title(response.text), "related_books": parse_related_books(response.text)}
 
 
 class Goodreads_Scraper:
-    def __init__(self, logger, stop_event, minimum_rating, minimum_votes, goodreads_wait_delay):
+    def __init__(self, logger, stop_event, minimum_rating, minimum_votes, goodreads_wait_delay, thread_limit, driver_max_pages, http_fast_path, book_link_cache, metrics, requests_per_second, max_requests_per_second, memory_governor=None, base_url=GOODREADS_URL):
         self.diagnostic_logger = logger
         self.stop_event = stop_event
         self.minimum_rating = minimum_rating
         self.minimum_votes = minimum_votes
         self.goodreads_wait_delay = goodreads_wait_delay
+        self.base_url = base_url
         self.user_agents = [
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/111.0.0.0 Safari/537.36",
             "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/111.0.0.0 Safari/537.36",
@@ -27,96 +189,223 @@ class Goodreads_Scraper:
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/111.0.0.0 Safari/537.36 Edg/111.0.1661.62",
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.93 Safari/537.36",
         ]
-        self.firexfox_options = webdriver.FirefoxOptions()
-        self.firexfox_options.add_argument("--no-sandbox")
-        self.firexfox_options.add_argument("--disable-dev-shm-usage")
-        self.firexfox_options.add_argument("--avoid-stats=true")
-        self.firexfox_options.add_argument("--window-size=1280,768")
+        self.browser_arguments = ["--no-sandbox", "--disable-dev-shm-usage", "--avoid-stats=true", "--window-size=1280,768"]
         if "linux" in platform.platform().lower():
             display = Display(backend="xvfb", visible=False, size=(1280, 768))
             display.start()
         else:
-            self.firexfox_options.add_argument("--headless")
+            self.browser_arguments.append("--headless")
+        self.driver_pool = _drivers.Driver_Pool(self.diagnostic_logger, self.user_agents, self.browser_arguments, thread_limit, driver_max_pages, memory_governor)
+        self.http_fast_path = http_fast_path
+        self.book_link_cache = book_link_cache
+        self.metrics = metrics
+        self.http_scraper = Goodreads_Http_Scraper(self.diagnostic_logger, self.user_agents, self.goodreads_wait_delay, max(1, thread_limit), self.base_url)
+        self.limiter = _throttle.Adaptive_Limiter(self.diagnostic_logger, thread_limit, requests_per_second, max_requests_per_second)
 
-    def get_firexfox_driver(self):
-        firexfox_options = self.firexfox_options
-        firexfox_options.add_argument(f"--user-agent={random.choice(self.user_agents)}")
-        if "linux" in platform.platform().lower():
-            return webdriver.Firefox(options=firexfox_options, service=FireFoxService(GeckoDriverManager().install()))
-        else:
-            return webdriver.Firefox(options=firexfox_options)
+    def paced_request(self, path, load_page, *args):
+        if not self.limiter.acquire_request(self.stop_event):
+            raise Exception("Stop request detected")
+        request_start = time.monotonic()
+        try:
+            result = load_page(*args)
+        except Exception as e:
+            status_code = getattr(getattr(e, "response", None), "status_code", None)
+            self.limiter.record(time.monotonic() - request_start, False, throttled=isinstance(e, Throttled_Page_Error) or status_code in THROTTLE_STATUS_CODES, path=path)
+            raise
+        self.limiter.record(time.monotonic() - request_start, True, path=path)
+        return result
+
+    def load_browser_page(self, driver, url):
+        # driver.get does not raise on HTTP errors, so throttling has to be read back from the loaded page
+        self.driver_pool.load_page(driver, url)
+        try:
+            status_code = driver.execute_script(NAVIGATION_STATUS_SCRIPT)
+        except Exception:
+            status_code = None
+        page_title = driver.title or ""
+        if status_code in THROTTLE_STATUS_CODES or any(marker in page_title for marker in THROTTLE_PAGE_TITLES):
+            raise Throttled_Page_Error(f"Goodreads throttled {url} (status: {status_code}, title: {page_title!r})")
+
+    def is_matching_book(self, query, item_title, item_author):
+        book_string = f"{item_author} - {item_title}"
+        match_ratio = fuzz.ratio(book_string, query)
+        if match_ratio > 90 or query in book_string:
+            self.diagnostic_logger.info(f"Found: {item_title} by {item_author} as {match_ratio}% match for {query}")
+            return True
+        return False
+
+    def is_expected_page(self, query, page_title):
+        seed_title = query.split(" - ", 1)[-1]
+        return fuzz.token_set_ratio(seed_title, page_title) >= 90
 
-    def goodreads_recommendations(self, query):
+    def build_book_detail(self, query, title, author, rating, votes, image_url):
+        vote_count = votes if isinstance(votes, int) else parse_vote_count(votes)
+        ratings_value = 0.0 if rating == "" else float(rating)
+        if ratings_value > self.minimum_rating and vote_count > self.minimum_votes:
+            return {
+                "Name": title,
+                "Author": author,
+                "Rating": f"Rating: {rating}",
+                "Votes": f"Votes: {votes:,}" if isinstance(votes, int) else f"Votes: {votes}",
+                "Overview": "",
+                "Image_Link": image_url,
+                "Base_Book": query,
+                "Status": "",
+                "Page_Count": "",
+                "Published_Date": "",
+                "Rating_Value": ratings_value,
+                "Vote_Count": vote_count,
+            }
+        return None
+
+    def goodreads_recommendations(self, query, book_link=None):
+        if not self.limiter.acquire_slot(self.stop_event):
+            return []
+        try:
+            # Links found by a search were matched on title and author, so they are tried before the Readarr id
+            book_link = self.book_link_cache.get(query) or book_link
+            if self.http_fast_path:
+                similar_books = self.http_recommendations(query, book_link)
+                if similar_books is not None:
+                    self.metrics.increment("goodreads_recommendations_total", path="http")
+                    return similar_books
+                self.diagnostic_logger.info(f"Fast path failed for {query}, falling back to browser")
+            self.metrics.increment("goodreads_recommendations_total", path="browser")
+            return self.browser_recommendations(query, self.book_link_cache.get(query) or book_link)
+
+        finally:
+            self.limiter.release_slot()
+
+    def http_recommendations(self, query, book_link=None):
+        # None means the page could not be fetched or parsed, an empty list means every similar book was filtered out
         similar_books = []
+        try:
+            if self.stop_event.is_set():
+                return []
+            book_page = None
+            if book_link:
+                stage_start = time.monotonic()
+                book_page = self.paced_request("http", self.http_scraper.book_page, book_link)
+                self.metrics.observe_since("goodreads_stage_seconds", stage_start, stage="http_book_page_load")
+                if not self.is_expected_page(query, book_page["title"]):
+                    self.diagnostic_logger.warning(f"{book_link} shows {book_page['title']!r} instead of {query}, searching instead")
+                    book_page = None
+
+            if not book_page:
+                stage_start = time.monotonic()
+                search_results = self.paced_request("http", self.http_scraper.search, query)
+                self.metrics.observe_since("goodreads_stage_seconds", stage_start, stage="http_search_page_load")
+                for result in search_results:
+                    if self.is_matching_book(query, result["title"], result["author"]):
+                        book_link = result["link"]
+                        self.book_link_cache.put(query, book_link)
+                        break
+                else:
+                    raise Exception(f"Could not Find a link for book: {query}")
+
+                stage_start = time.monotonic()
+                book_page = self.paced_request("http", self.http_scraper.book_page, book_link)
+                self.metrics.observe_since("goodreads_stage_seconds", stage_start, stage="http_book_page_load")
+
+            if not book_page["related_books"]:
+                raise Exception("No similar books in the page data")
+            for related_book in book_page["related_books"]:
+                new_book_detail = self.build_book_detail(query, related_book["title"], related_book["author"], related_book["rating"], related_book["votes"], related_book["image_url"])
+                if new_book_detail:
+                    similar_books.append(new_book_detail)
+
+        except Exception as e:
+            self.diagnostic_logger.info(f"Fast path failed for {query}: {str(e)}")
+            return None
+
+        return similar_books
+
+    def browser_find_book_link(self, driver, query):
         book_link = None
-        driver = None
+        stage_start = time.monotonic()
         try:
-            try:
-                if self.stop_event.is_set():
-                    self.diagnostic_logger.info("Stop request detected, exiting...")
-                    return []
-                self.diagnostic_logger.error(f"Creating New Driver...")
-                driver = self.get_firexfox_driver()
-                url = f"https://www.goodreads.com/search?q={query.replace(' ', '+')}"
-                driver.get(url)
+            wait = WebDriverWait(driver, self.goodreads_wait_delay)
+            self.diagnostic_logger.info(f"Waiting to see if Overlay is displayed...")
+            overlay = wait.until(lambda driver: self.stop_event.is_set() or EC.visibility_of_element_located((By.CLASS_NAME, "Overlay__window"))(driver))
+            if self.stop_event.is_set():
+                self.diagnostic_logger.info("Stop request detected, exiting...")
+                return None
 
-            except Exception as e:
-                self.diagnostic_logger.error(f"Failed to create driver: {str(e)}")
-                raise Exception("Failed to create driver...")
+        except Exception as e:
+            self.diagnostic_logger.info(f"No Overlay displayed, continuing...")
+            overlay = None
 
-            try:
-                wait = WebDriverWait(driver, self.goodreads_wait_delay)
-                self.diagnostic_logger.info(f"Waiting to see if Overlay is displayed...")
-                overlay = wait.until(lambda driver: self.stop_event.is_set() or EC.visibility_of_element_located((By.CLASS_NAME, "Overlay__window"))(driver))
+        self.metrics.observe_since("goodreads_stage_seconds", stage_start, stage="search_overlay_wait")
+        try:
+            if self.stop_event.is_set():
+                self.diagnostic_logger.info("Stop request detected, exiting...")
+                return None
+            if overlay:
+                self.diagnostic_logger.info(f"Overlay displayed on search, attempting to close it...")
+                close_div = overlay.find_element(By.CLASS_NAME, "modal__close")
+                close_button = close_div.find_element(By.CSS_SELECTOR, "img[alt='Dismiss']")
+                close_button.click()
+
+        except Exception as e:
+            self.diagnostic_logger.error(f"Failed to close overlay: {str(e)}")
+            self.diagnostic_logger.info(f"Trying to continue")
+
+        stage_start = time.monotonic()
+        try:
+            driver.find_element(By.TAG_NAME, "body").send_keys(Keys.PAGE_DOWN, Keys.PAGE_DOWN)
+            table = driver.find_element(By.CLASS_NAME, "tableList")
+            search_results = table.find_elements(By.CSS_SELECTOR, "tr")
+
+            for result in search_results:
                 if self.stop_event.is_set():
                     self.diagnostic_logger.info("Stop request detected, exiting...")
-                    return []
+                    return None
+                item_title_element = result.find_element(By.CSS_SELECTOR, "span[itemprop='name']")
+                item_title = item_title_element.text.strip()
 
-            except Exception as e:
-                self.diagnostic_logger.info(f"No Overlay displayed, continuing...")
-                overlay = None
+                author_tag = result.find_element(By.CSS_SELECTOR, "span[itemprop='author']")
+                item_author = author_tag.find_element(By.CSS_SELECTOR, "span[itemprop='name']").text.strip()
+
+                if self.is_matching_book(query, item_title, item_author):
+                    book_link_element = result.find_element(By.CSS_SELECTOR, "a.bookTitle")
+                    book_link = book_link_element.get_attribute("href")
+                    break
+            else:
+                self.diagnostic_logger.info(f"No Matching book for {query}")
+
+        except Exception as e:
+            self.diagnostic_logger.error(f"Error trying to get link: {str(e)}")
 
+        self.metrics.observe_since("goodreads_stage_seconds", stage_start, stage="link_match")
+        return book_link
+
+    def browser_recommendations(self, query, book_link=None):
+        similar_books = []
+        driver = None
+        try:
             try:
                 if self.stop_event.is_set():
                     self.diagnostic_logger.info("Stop request detected, exiting...")
                     return []
-                if overlay:
-                    self.diagnostic_logger.info(f"Overlay displayed on search, attempting to close it...")
-                    close_div = overlay.find_element(By.CLASS_NAME, "modal__close")
-                    close_button = close_div.find_element(By.CSS_SELECTOR, "img[alt='Dismiss']")
-                    close_button.click()
+                stage_start = time.monotonic()
+                driver = self.driver_pool.acquire()
+                self.metrics.observe_since("goodreads_stage_seconds", stage_start, stage="driver_creation")
+                if not book_link:
+                    stage_start = time.monotonic()
+                    url = f"{self.base_url}/search?q={query.replace(' ', '+')}"
+                    self.paced_request("browser", self.load_browser_page, driver, url)
+                    self.metrics.observe_since("goodreads_stage_seconds", stage_start, stage="search_page_load")
 
             except Exception as e:
-                self.diagnostic_logger.error(f"Failed to close overlay: {str(e)}")
-                self.diagnostic_logger.info(f"Trying to continue")
-
-            try:
-                driver.find_element(By.TAG_NAME, "body").send_keys(Keys.PAGE_DOWN, Keys.PAGE_DOWN)
-                table = driver.find_element(By.CLASS_NAME, "tableList")
-                search_results = table.find_elements(By.CSS_SELECTOR, "tr")
-
-                for result in search_results:
-                    if self.stop_event.is_set():
-                        self.diagnostic_logger.info("Stop request detected, exiting...")
-                        return []
-                    item_title_element = result.find_element(By.CSS_SELECTOR, "span[itemprop='name']")
-                    item_title = item_title_element.text.strip()
-
-                    author_tag = result.find_element(By.CSS_SELECTOR, "span[itemprop='author']")
-                    item_author = author_tag.find_element(By.CSS_SELECTOR, "span[itemprop='name']").text.strip()
-
-                    book_string = f"{item_author} - {item_title}"
-                    match_ratio = fuzz.ratio(book_string, query)
-                    if match_ratio > 90 or query in book_string:
-                        self.diagnostic_logger.error(f"Found: {item_title} by {item_author} as {match_ratio}% match for {query}")
-                        book_link_element = result.find_element(By.CSS_SELECTOR, "a.bookTitle")
-                        book_link = book_link_element.get_attribute("href")
-                        break
-                else:
-                    self.diagnostic_logger.info(f"No Matching book for {query}")
+                self.diagnostic_logger.error(f"Failed to create driver: {str(e)}")
+                raise Exception("Failed to create driver...")
 
-            except Exception as e:
-                self.diagnostic_logger.error(f"Error trying to get link: {str(e)}")
+            if not book_link:
+                book_link = self.browser_find_book_link(driver, query)
+                if self.stop_event.is_set():
+                    return []
+                if book_link:
+                    self.book_link_cache.put(query, book_link)
 
             try:
                 if not book_link:
@@ -124,7 +413,20 @@ class Goodreads_Scraper:
                 if not all([urlparse(book_link).scheme, urlparse(book_link).netloc]):
                     raise Exception(f"Invalid URL: {book_link}")
 
-                driver.get(book_link)
+                stage_start = time.monotonic()
+                self.paced_request("browser", self.load_browser_page, driver, book_link)
+                if not self.is_expected_page(query, driver.title):
+                    self.diagnostic_logger.warning(f"{book_link} shows {driver.title!r} instead of {query}, searching instead")
+                    self.paced_request("browser", self.load_browser_page, driver, f"{self.base_url}/search?q={query.replace(' ', '+')}")
+                    book_link = self.browser_find_book_link(driver, query)
+                    if self.stop_event.is_set():
+                        return []
+                    if not book_link:
+                        raise Exception(f"Could not Find a link for book: {query}")
+                    self.book_link_cache.put(query, book_link)
+                    self.paced_request("browser", self.load_browser_page, driver, book_link)
+                self.metrics.observe_since("goodreads_stage_seconds", stage_start, stage="book_page_load")
+                stage_start = time.monotonic()
                 try:
                     wait = WebDriverWait(driver, self.goodreads_wait_delay)
                     self.diagnostic_logger.info(f"Waiting to see if Overlay is displayed...")
@@ -137,6 +439,7 @@ class Goodreads_Scraper:
                     self.diagnostic_logger.info(f"No Overlay displayed, continuing...")
                     overlay = None
 
+                self.metrics.observe_since("goodreads_stage_seconds", stage_start, stage="book_overlay_wait")
                 if overlay:
                     try:
                         self.diagnostic_logger.info(f"Overlay displayed on book link, attempting to close it...")
@@ -147,6 +450,7 @@ class Goodreads_Scraper:
                         self.diagnostic_logger.error(f"Failed to close overlay: {str(e)}")
                         self.diagnostic_logger.info(f"Attempting to Continue")
 
+                stage_start = time.monotonic()
                 try:
                     if self.stop_event.is_set():
                         self.diagnostic_logger.info("Stop request detected, exiting...")
@@ -168,56 +472,47 @@ class Goodreads_Scraper:
                         self.diagnostic_logger.error(f"Failed to get book info: {str(e)}")
                         raise Exception("No Valid Carousel")
 
+                self.metrics.observe_since("goodreads_stage_seconds", stage_start, stage="carousel_wait")
                 if self.stop_event.is_set():
                     self.diagnostic_logger.info("Stop request detected, exiting...")
                     return []
 
-                next_button = driver.find_element(By.CSS_SELECTOR, 'button[aria-label="Carousel, Next page"]')
-                book_cards = carousel.find_elements(By.CLASS_NAME, "BookCard")
-
-                total_cards = len(book_cards)
-                for i in range(0, total_cards, 4):
-                    book_cards = carousel.find_elements(By.CLASS_NAME, "BookCard")
-                    for card in book_cards[i : i + 4]:
-                        try:
-                            if self.stop_event.is_set():
-                                self.diagnostic_logger.info("Stop request detected, exiting...")
-                                return []
-                            title = card.find_element(By.CSS_SELECTOR, '[data-testid="title"]').text
-                            author = card.find_element(By.CSS_SELECTOR, '[data-testid="author"]').text
-                            rating = card.find_element(By.CLASS_NAME, "AverageRating__ratingValue").text
-                            votes = card.find_element(By.CSS_SELECTOR, '[data-testid="ratingsCount"]').text.strip()
-                            image = card.find_element(By.CSS_SELECTOR, "img.ResponsiveImage")
-                            image_url = image.get_attribute("src")
-                            if "m" in votes:
-                                vote_count = int(float(votes.replace("m", "").replace(",", "")) * 1000000)
-                            elif "k" in votes:
-                                vote_count = int(float(votes.replace("k", "").replace(",", "")) * 1000)
-                            else:
-                                vote_count = int(0 if votes.replace(",", "") == "" else votes.replace(",", ""))
-                            ratings_value = 0.0 if rating == "" else float(rating)
-                            if ratings_value > self.minimum_rating and vote_count > self.minimum_votes:
-                                new_book_detail = {
-                                    "Name": title,
-                                    "Author": author,
-                                    "Rating": f"Rating: {rating}",
-                                    "Votes": f"Votes: {votes}",
-                                    "Overview": "",
-                                    "Image_Link": image_url,
-                                    "Base_Book": query,
-                                    "Status": "",
-                                    "Page_Count": "",
-                                    "Published_Date": "",
-                                }
-                                similar_books.append(new_book_detail)
-
-                        except Exception as e:
-                            self.diagnostic_logger.error(f"Failed to get book info: {str(e)}")
-
-                    if i + 4 < total_cards and next_button.is_enabled():
-                        next_button.click()
-                        self.diagnostic_logger.info(f"Checking Next Batch...")
-                        self.stop_event.wait(1)
+                carousel_cards = {}
+                while True:
+                    stage_start = time.monotonic()
+                    card_batch = driver.execute_script(CAROUSEL_EXTRACTION_SCRIPT, carousel)
+                    self.metrics.observe_since("goodreads_stage_seconds", stage_start, stage="card_extraction")
+                    for card in card_batch:
+                        if card["title"]:
+                            carousel_cards.setdefault((card["title"], card["author"]), card)
+
+                    # Only page through the carousel when some cards have not been rendered yet
+                    loaded_count = sum(1 for card in card_batch if card["title"])
+                    if loaded_count == len(card_batch) or self.stop_event.is_set():
+                        break
+                    next_buttons = driver.find_elements(By.CSS_SELECTOR, 'button[aria-label="Carousel, Next page"]')
+                    if not next_buttons or not next_buttons[0].is_enabled():
+                        break
+                    next_buttons[0].click()
+                    self.diagnostic_logger.info(f"Waiting for {len(card_batch) - loaded_count} lazy loaded cards...")
+                    try:
+                        wait = WebDriverWait(driver, self.goodreads_wait_delay)
+                        wait.until(lambda driver: self.stop_event.is_set() or sum(1 for card in driver.execute_script(CAROUSEL_EXTRACTION_SCRIPT, carousel) if card["title"]) > loaded_count)
+                    except Exception as e:
+                        self.diagnostic_logger.info(f"No more cards loaded, continuing...")
+                        break
+
+                if self.stop_event.is_set():
+                    self.diagnostic_logger.info("Stop request detected, exiting...")
+                    return []
+                for card in carousel_cards.values():
+                    try:
+                        new_book_detail = self.build_book_detail(query, card["title"], card["author"], card["rating"], card["votes"], card["image_url"])
+                        if new_book_detail:
+                            similar_books.append(new_book_detail)
+
+                    except Exception as e:
+                        self.diagnostic_logger.error(f"Failed to get book info: {str(e)}")
 
             except Exception as e:
                 self.diagnostic_logger.error(f"Error extracting data: {str(e)}")
@@ -228,5 +523,5 @@ class Goodreads_Scraper:
         finally:
             self.diagnostic_logger.info(f"Discovered {len(similar_books)} potential books")
             if driver:
-                driver.quit()
+                self.driver_pool.release(driver)
             return similar_books
@@ -0,0 +1,127 @@
+import re
+import bisect
+import threading
+
+
+def tokenize(text):
+    return re.findall(r"\w+", text.lower())
+
+
+class Sidebar_Index:
+    def __init__(self, search_cache_size=16):
+        self.search_cache_size = search_cache_size
+        self.lock = threading.Lock()
+        self.version = 0
+        self.rebuild([])
+
+    def rebuild(self, items):
+        with self.lock:
+            self.items = []
+            self.ids_by_name = {}
+            self.postings = {}
+            self.selected_ids = set()
+            for item in items:
+                self._add(item)
+            self.sorted_tokens = sorted(self.postings)
+            self._changed()
+
+    def _add(self, item):
+        if item["name"] in self.ids_by_name:
+            return None
+        item_id = len(self.items)
+        self.items.append(item)
+        self.ids_by_name[item["name"]] = item_id
+        new_tokens = []
+        for token in set(tokenize(item["name"])):
+            if token not in self.postings:
+                self.postings[token] = []
+                new_tokens.append(token)
+            self.postings[token].append(item_id)
+        if item.get("checked"):
+            self.selected_ids.add(item_id)
+        return new_tokens
+
+    def _changed(self):
+        self.version += 1
+        self.search_cache = {}
+
+    def add(self, item):
+        with self.lock:
+            new_tokens = self._add(item)
+            if new_tokens is None:
+                return
+            for token in new_tokens:
+                bisect.insort(self.sorted_tokens, token)
+            self._changed()
+
+    def __len__(self):
+        return len(self.items)
+
+    def find(self, name):
+        with self.lock:
+            item_id = self.ids_by_name.get(name)
+            return None if item_id is None else self.items[item_id]
+
+    def _matching_ids(self, search):
+        search_key = " ".join(tokenize(search))
+        if not search_key:
+            return range(len(self.items))
+        if search_key in self.search_cache:
+            return self.search_cache[search_key]
+
+        # Every search token must prefix one of the item's name tokens
+        matching_ids = None
+        for token in search_key.split():
+            token_ids = set()
+            position = bisect.bisect_left(self.sorted_tokens, token)
+            while position < len(self.sorted_tokens) and self.sorted_tokens[position].startswith(token):
+                token_ids.update(self.postings[self.sorted_tokens[position]])
+                position += 1
+            matching_ids = token_ids if matching_ids is None else matching_ids & token_ids
+            if not matching_ids:
+                break
+        matching_ids = sorted(matching_ids)
+
+        if len(self.search_cache) >= self.search_cache_size:
+            self.search_cache.pop(next(iter(self.search_cache)))
+        self.search_cache[search_key] = matching_ids
+        return matching_ids
+
+    def query(self, search="", offset=0, limit=100):
+        with self.lock:
+            matching_ids = self._matching_ids(search)
+            page_ids = matching_ids[offset : offset + limit]
+            items = [{**self.items[item_id], "id": item_id, "checked": item_id in self.selected_ids} for item_id in page_ids]
+            matching_selected = len(self.selected_ids) if not search.strip() else sum(1 for item_id in matching_ids if item_id in self.selected_ids)
+            return {"Items": items, "Offset": offset, "Total": len(matching_ids), "Selected": len(self.selected_ids), "Matching_Selected": matching_selected}
+
+    def select(self, item_ids, checked):
+        with self.lock:
+            valid_ids = {item_id for item_id in item_ids if isinstance(item_id, int) and 0 <= item_id < len(self.items)}
+            if checked:
+                self.selected_ids |= valid_ids
+            else:
+                self.selected_ids -= valid_ids
+            self.version += 1
+
+    def select_matching(self, search, checked):
+        with self.lock:
+            matching_ids = self._matching_ids(search)
+        self.select(matching_ids, checked)
+
+    def select_names(self, names):
+        with self.lock:
+            self.selected_ids = {self.ids_by_name[name] for name in names if name in self.ids_by_name}
+            self.version += 1
+
+    def selected_names(self):
+        with self.lock:
+            return [self.items[item_id]["name"] for item_id in sorted(self.selected_ids)]
+
+    def export(self):
+        with self.lock:
+            return [{**item, "checked": item_id in self.selected_ids} for item_id, item in enumerate(self.items)]
+
+    def get_summary(self):
+        with self.lock:
+            return {"Total": len(self.items), "Selected": len(self.selected_ids)}
@@ -0,0 +1,135 @@
+import json
+import time
+import sqlite3
+import threading
+import socketio
+
+
+class Memory_State_Store:
+    shared = False
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = {}
+
+    def get(self, key, default=None):
+        with self.lock:
+            return self.values.get(key, default)
+
+    def set_many(self, values):
+        with self.lock:
+            self.values.update(values)
+
+    def try_acquire_leadership(self, owner, ttl):
+        return True
+
+    def push_command(self, name, payload):
+        raise Exception("Commands are only queued between workers of a shared state store")
+
+    def pop_commands(self):
+        return []
+
+
+class Sqlite_State_Store:
+    shared = True
+
+    def __init__(self, logger, db_path):
+        self.diagnostic_logger = logger
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False, timeout=30, isolation_level=None)
+        with self.lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL)")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS commands (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, payload TEXT NOT NULL, created_at REAL NOT NULL)")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS leader (id INTEGER PRIMARY KEY CHECK (id = 1), owner TEXT NOT NULL, expires_at REAL NOT NULL)")
+
+    def get(self, key, default=None):
+        with self.lock:
+            row = self.connection.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_many(self, values):
+        now = time.time()
+        rows = [(key, json.dumps(value), now) for key, value in values.items()]
+        with self.lock:
+            self.connection.executemany("INSERT OR REPLACE INTO state (key, value, updated_at) VALUES (?, ?, ?)", rows)
+
+    def try_acquire_leadership(self, owner, ttl):
+        now = time.time()
+        try:
+            with self.lock:
+                self.connection.execute("BEGIN IMMEDIATE")
+                try:
+                    row = self.connection.execute("SELECT owner, expires_at FROM leader WHERE id = 1").fetchone()
+                    is_leader = not row or row[0] == owner or row[1] < now
+                    if is_leader:
+                        self.connection.execute("INSERT OR REPLACE INTO leader (id, owner, expires_at) VALUES (1, ?, ?)", (owner, now + ttl))
+                    self.connection.execute("COMMIT")
+                except Exception:
+                    self.connection.execute("ROLLBACK")
+                    raise
+            return is_leader
+
+        except Exception as e:
+            self.diagnostic_logger.error(f"Leader election error: {str(e)}")
+            return False
+
+    def push_command(self, name, payload):
+        with self.lock:
+            self.connection.execute("INSERT INTO commands (name, payload, created_at) VALUES (?, ?, ?)", (name, json.dumps(payload), time.time()))
+
+    def pop_commands(self):
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self.connection.execute("SELECT id, name, payload FROM commands ORDER BY id").fetchall()
+                if rows:
+                    self.connection.execute("DELETE FROM commands WHERE id <= ?", (rows[-1][0],))
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+        return [(name, json.loads(payload)) for _, name, payload in rows]
+
+
+class Sqlite_Pub_Sub_Manager(socketio.PubSubManager):
+    name = "sqlite"
+
+    def __init__(self, db_path, channel="flask-socketio", write_only=False, poll_interval=0.05, retention=60):
+        super().__init__(channel=channel, write_only=write_only)
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False, timeout=30, isolation_level=None)
+        with self.lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS messages (id INTEGER PRIMARY KEY AUTOINCREMENT, channel TEXT NOT NULL, payload TEXT NOT NULL, created_at REAL NOT NULL)")
+
+    def _publish(self, data):
+        with self.lock:
+            self.connection.execute("INSERT INTO messages (channel, payload, created_at) VALUES (?, ?, ?)", (self.channel, self.json.dumps(data), time.time()))
+
+    def _listen(self):
+        with self.lock:
+            last_id = self.connection.execute("SELECT COALESCE(MAX(id), 0) FROM messages").fetchone()[0]
+        last_prune = time.monotonic()
+        while True:
+            with self.lock:
+                rows = self.connection.execute("SELECT id, payload FROM messages WHERE id > ? AND channel = ? ORDER BY id", (last_id, self.channel)).fetchall()
+            for message_id, payload in rows:
+                last_id = message_id
+                yield payload
+
+            if time.monotonic() - last_prune > self.retention:
+                with self.lock:
+                    self.connection.execute("DELETE FROM messages WHERE created_at < ?", (time.time() - self.retention,))
+                last_prune = time.monotonic()
+            self.server.sleep(self.poll_interval)
+
+
+def create_state_store(logger, backend, db_path):
+    if backend == "sqlite":
+        return Sqlite_State_Store(logger, db_path)
+    if backend != "memory":
+        logger.error(f"Unknown state backend: {backend}, using memory")
+    return Memory_State_Store()
@@ -0,0 +1,141 @@
+import time
+import threading
+
+
+class Token_Bucket:
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError(f"Token bucket rate must be greater than 0, got {rate}")
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.tokens = self.burst
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def set_rate(self, rate):
+        if rate <= 0:
+            raise ValueError(f"Token bucket rate must be greater than 0, got {rate}")
+        with self.lock:
+            self._refill()
+            self.rate = rate
+            self.burst = max(1.0, rate)
+            self.tokens = min(self.tokens, self.burst)
+
+    def acquire(self, stop_event):
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait_time = (1 - self.tokens) / self.rate
+            if stop_event.wait(wait_time):
+                return False
+
+
+class Adaptive_Limiter:
+    def __init__(self, logger, max_concurrency, rate, max_rate, window_size=8, max_error_rate=0.1, latency_tolerance=2.0, cooldown=5.0):
+        self.diagnostic_logger = logger
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_rate = min(rate, max_rate) / 4
+        self.max_rate = max_rate
+        self.window_size = window_size
+        self.max_error_rate = max_error_rate
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self.condition = threading.Condition()
+        self.token_bucket = Token_Bucket(rate)
+        self.concurrency_limit = 1
+        self.in_flight = 0
+        self.samples = {}
+        self.baseline_latencies = {}
+        self.last_decrease = 0.0
+        self.change_callbacks = []
+
+    def on_change(self, callback):
+        self.change_callbacks.append(callback)
+
+    def acquire_slot(self, stop_event):
+        with self.condition:
+            while self.in_flight >= self.concurrency_limit:
+                if stop_event.is_set():
+                    return False
+                self.condition.wait(0.5)
+            self.in_flight += 1
+            return True
+
+    def release_slot(self):
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def acquire_request(self, stop_event):
+        return self.token_bucket.acquire(stop_event)
+
+    def record(self, latency, success, throttled=False, path="http"):
+        # HTTP requests and browser page loads take very different times, so each path keeps its own window and baseline
+        with self.condition:
+            samples = self.samples.setdefault(path, [])
+            samples.append((latency, success))
+            if throttled:
+                change = self._decrease("throttled")
+            elif len(samples) >= self.window_size:
+                change = self._evaluate_window(path)
+            else:
+                change = None
+        if change:
+            self._notify(change)
+
+    def _evaluate_window(self, path):
+        samples = self.samples.pop(path)
+        latencies = [latency for latency, success in samples if success]
+        error_rate = sum(1 for _, success in samples if not success) / len(samples)
+        average_latency = sum(latencies) / len(latencies) if latencies else None
+        baseline_latency = self.baseline_latencies.get(path)
+        if average_latency is not None:
+            baseline_latency = average_latency if baseline_latency is None else min(baseline_latency * 1.05, average_latency)
+            self.baseline_latencies[path] = baseline_latency
+
+        if error_rate > self.max_error_rate:
+            return self._decrease(f"{path} error rate {error_rate:.0%}")
+        if average_latency is not None and average_latency > baseline_latency * self.latency_tolerance:
+            return self._decrease(f"{path} latency {average_latency:.2f}s")
+        return self._increase()
+
+    def _increase(self):
+        new_limit = min(self.max_concurrency, self.concurrency_limit + 1)
+        new_rate = min(self.max_rate, self.token_bucket.rate + 0.25)
+        if new_limit == self.concurrency_limit and new_rate == self.token_bucket.rate:
+            return None
+        self.concurrency_limit = new_limit
+        self.token_bucket.set_rate(new_rate)
+        self.condition.notify_all()
+        return "healthy"
+
+    def _decrease(self, reason):
+        now = time.monotonic()
+        if now - self.last_decrease < self.cooldown:
+            return None
+        self.last_decrease = now
+        self.samples = {}
+        self.concurrency_limit = max(1, self.concurrency_limit // 2)
+        self.token_bucket.set_rate(max(self.min_rate, self.token_bucket.rate / 2))
+        return reason
+
+    def get_limits(self):
+        with self.condition:
+            return {"Concurrency": self.concurrency_limit, "Max_Concurrency": self.max_concurrency, "In_Flight": self.in_flight, "Rate": round(self.token_bucket.rate, 2), "Max_Rate": self.max_rate}
+
+    def _notify(self, reason):
+        limits = self.get_limits()
+        self.diagnostic_logger.info(f"Goodreads limits changed ({reason}) - Concurrency: {limits['Concurrency']}/{limits['Max_Concurrency']}, Rate: {limits['Rate']:.2f}/s")
+        for callback in self.change_callbacks:
+            try:
+                callback(limits)
+            except Exception as e:
+                self.diagnostic_logger.error(f"Limit change callback error: {str(e)}")
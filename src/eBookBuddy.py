@@ -2,15 +2,29 @@ import json
 import time
 import logging
 import os
-import random
+import platform
+import queue
 import threading
 import concurrent.futures
-from flask import Flask, render_template, request
+from flask import Flask, Response, jsonify, redirect, render_template, request, send_file
 from flask_socketio import SocketIO
-import requests
 from thefuzz import fuzz
-from unidecode import unidecode
 import _scrapers
+import _readarr
+import _caches
+import _dedup
+import _library
+import _emitter
+import _http_client
+import _crawl
+import _ranking
+import _metrics
+import _memory
+import _state
+import _results
+import _sidebar
+import _images
+import _throttle
 
 
 class DataHandler:
@@ -28,23 +42,209 @@ class DataHandler:
         self.search_exhausted_flag = True
         self.clients_connected_counter = 0
         self.config_folder = "config"
-        self.recommended_books = []
+        self.result_store = _results.Result_Store()
+        self.ranking_snapshots = _results.Ranking_Snapshots()
+        self.recommended_books_index = _dedup.Dedup_Index()
+        self.ranking_engine = _ranking.Ranking_Engine()
         self.readarr_items = []
-        self.cleaned_readarr_items = []
+        self.library_index = _library.Library_Index()
+        self.sidebar_index = _sidebar.Sidebar_Index()
+        self.shared_sidebar_version = None
+        self.state_dirty = False
+        self.state_publish_interval = 1
+        self.last_state_publish = 0
+        self.published_versions = {}
         self.stop_event = threading.Event()
         self.stop_event.set()
         if not os.path.exists(self.config_folder):
             os.makedirs(self.config_folder)
         self.load_environ_or_config_settings()
-        self.goodreads_scraper = _scrapers.Goodreads_Scraper(self.diagnostic_logger, self.stop_event, self.minimum_rating, self.minimum_votes, self.goodreads_wait_delay)
-        if self.auto_start:
+        self.metrics = _metrics.Metrics_Registry()
+        self.book_link_cache = _caches.Book_Link_Cache(self.diagnostic_logger, os.path.join(self.config_folder, "book_links.db"))
+        self.memory_governor = _memory.Memory_Governor(self.diagnostic_logger, self.browser_memory_budget, self.browser_memory_ceiling)
+        self.goodreads_scraper = _scrapers.Goodreads_Scraper(self.diagnostic_logger, self.stop_event, self.minimum_rating, self.minimum_votes, self.goodreads_wait_delay, self.thread_limit, self.driver_max_pages, self.goodreads_http_fast_path, self.book_link_cache, self.metrics, self.goodreads_requests_per_second, self.goodreads_max_requests_per_second, self.memory_governor)
+        self.goodreads_scraper.limiter.on_change(lambda limits: socketio.emit("goodreads_limits", limits))
+        self.book_emitter = _emitter.Emission_Buffer(socketio, "more_books_loaded")
+        self.http_client = _http_client.Http_Client(self.diagnostic_logger, pool_size=max(10, self.readarr_sync_workers))
+        self.http_client.configure_endpoint("readarr", self.readarr_api_timeout)
+        self.http_client.configure_endpoint("google_books", 10)
+        self.http_client.configure_endpoint("images", 15)
+        self.image_cache = _images.Image_Cache(self.diagnostic_logger, os.path.join(self.config_folder, "image_cache"), self.fetch_cover_image, self.image_cache_max_size * 1024 * 1024)
+        self.readarr_sync = _readarr.Readarr_Sync(self.diagnostic_logger, self.http_client, self.readarr_sync_workers)
+        self.recommendation_cache = _caches.Recommendation_Cache(self.diagnostic_logger, os.path.join(self.config_folder, "recommendation_cache.db"), self.recommendation_cache_ttl, self.recommendation_cache_max_entries)
+        self.google_books_cache = _caches.Google_Books_Cache(self.diagnostic_logger, os.path.join(self.config_folder, "google_books_cache.db"), self.google_books_cache_ttl, 1000)
+        self.readarr_author_index = _readarr.Readarr_Author_Index()
+        self.crawl_scheduler = _crawl.Crawl_Scheduler(self.diagnostic_logger, os.path.join(self.config_folder, "crawl_state.json"), self.crawl_max_depth)
+        self.library_snapshot = _readarr.Library_Snapshot(self.diagnostic_logger, os.path.join(self.config_folder, "library_snapshot.json"))
+        self.load_library_snapshot()
+        self.add_queue = queue.Queue()
+        add_queue_thread = threading.Thread(target=self.process_add_queue, name="Add_Book_Queue_Thread")
+        add_queue_thread.daemon = True
+        add_queue_thread.start()
+        self.google_books_prefetch_queue = queue.Queue(maxsize=200)
+        self.google_books_prefetch_bucket = _throttle.Token_Bucket(1)
+        self.google_books_prefetch_thread = None
+        self.register_metrics()
+        self.state_store = _state.create_state_store(self.diagnostic_logger, self.state_backend, os.path.join(self.config_folder, "state.db"))
+        self.worker_id = f"{platform.node()}-{os.getpid()}"
+        self.is_leader = self.state_store.try_acquire_leadership(self.worker_id, 30)
+        if self.state_store.shared:
+            self.diagnostic_logger.info(f"Worker {self.worker_id} started as {'leader' if self.is_leader else 'follower'}")
+            leadership_thread = threading.Thread(target=self.maintain_leadership, name="Leadership_Thread")
+            leadership_thread.daemon = True
+            leadership_thread.start()
+        if self.auto_start and self.is_leader:
+            self.schedule_auto_start()
+
+    def schedule_auto_start(self):
+        try:
+            # A saved snapshot lets the search start straight away, Readarr is reconciled once the usual delay has passed
+            startup_delay = min(self.auto_start_delay, 2) if self.readarr_items else self.auto_start_delay
+            auto_start_thread = threading.Timer(startup_delay, self.automated_startup, args=(self.auto_start_delay - startup_delay,))
+            auto_start_thread.daemon = True
+            auto_start_thread.start()
+
+        except Exception as e:
+            self.diagnostic_logger.error(f"Auto Start Error: {str(e)}")
+
+    def socketio_options(self):
+        if self.socketio_message_queue:
+            return {"message_queue": self.socketio_message_queue}
+        if self.state_store.shared:
+            return {"client_manager": _state.Sqlite_Pub_Sub_Manager(os.path.join(self.config_folder, "socketio_queue.db"))}
+        return {}
+
+    def maintain_leadership(self):
+        last_renewal = time.monotonic()
+        while True:
             try:
-                auto_start_thread = threading.Timer(self.auto_start_delay, self.automated_startup)
-                auto_start_thread.daemon = True
-                auto_start_thread.start()
+                if time.monotonic() - last_renewal >= 10:
+                    last_renewal = time.monotonic()
+                    was_leader = self.is_leader
+                    self.is_leader = self.state_store.try_acquire_leadership(self.worker_id, 30)
+                    if self.is_leader and not was_leader:
+                        self.diagnostic_logger.info(f"Worker {self.worker_id} took over as leader")
+                        if self.auto_start:
+                            self.schedule_auto_start()
+                    elif was_leader and not self.is_leader:
+                        self.diagnostic_logger.warning(f"Worker {self.worker_id} lost leadership, stopping search")
+                        self.stop_event.set()
+
+                if self.is_leader:
+                    for name, payload in self.state_store.pop_commands():
+                        self.run_command(name, payload)
+                    self.flush_state()
+                else:
+                    self.published_versions = {}
 
             except Exception as e:
-                self.diagnostic_logger.error(f"Auto Start Error: {str(e)}")
+                self.diagnostic_logger.error(f"Leadership Error: {str(e)}")
+
+            time.sleep(0.5)
+
+    def submit_command(self, name, payload=None):
+        if self.is_leader:
+            self.run_command(name, payload)
+        else:
+            self.state_store.push_command(name, payload)
+
+    def run_command(self, name, payload):
+        if name == "start_req":
+            self.start(payload)
+        elif name == "stop_req":
+            self.stop_event.set()
+            self.goodreads_scraper.driver_pool.close()
+            self.publish_state()
+        elif name == "adder":
+            self.add_to_readarr(payload)
+        elif name == "get_readarr_books":
+            thread = threading.Thread(target=self.request_books_from_readarr, name="Readarr_Thread")
+            thread.daemon = True
+            thread.start()
+        elif name == "update_settings":
+            self.update_settings(payload)
+            self.save_config_to_file()
+        elif name == "sidebar_select":
+            self.select_sidebar_items(payload)
+        elif name == "load_more_books":
+            thread = threading.Thread(target=self.find_similar_books, name="Find_Similar")
+            thread.daemon = True
+            thread.start()
+        else:
+            self.diagnostic_logger.error(f"Unknown command: {name}")
+
+    def publish_state(self):
+        # Writes are batched by the leadership thread, so bursts of changes cost one write per interval
+        if self.state_store.shared and self.is_leader:
+            self.state_dirty = True
+
+    def flush_state(self):
+        if not self.state_dirty or time.monotonic() - self.last_state_publish < self.state_publish_interval:
+            return
+        self.state_dirty = False
+        self.last_state_publish = time.monotonic()
+        try:
+            values = {"running": not self.stop_event.is_set(), "goodreads_limits": self.goodreads_scraper.limiter.get_limits()}
+            versions = {"sidebar_items": f"{self.worker_id}:{self.sidebar_index.version}", "seed_stats": (self.sidebar_index.version, self.crawl_scheduler.stats_version), "recommended_books": self.result_store.version}
+            changed = {key for key, version in versions.items() if self.published_versions.get(key) != version}
+            if "sidebar_items" in changed:
+                values["sidebar_items"] = self.sidebar_index.export()
+                values["sidebar_version"] = versions["sidebar_items"]
+            if "seed_stats" in changed:
+                values["seed_stats"] = self.get_seed_stats()
+            if "recommended_books" in changed:
+                values["recommended_books"] = self.result_store.all()
+            self.state_store.set_many(values)
+            self.published_versions.update({key: versions[key] for key in changed})
+
+        except Exception as e:
+            self.state_dirty = True
+            self.diagnostic_logger.error(f"Error Publishing State: {str(e)}")
+
+    def shared_state(self):
+        if self.is_leader:
+            return {"running": not self.stop_event.is_set(), "goodreads_limits": self.goodreads_scraper.limiter.get_limits()}
+        shared_keys = {"running": False, "goodreads_limits": self.goodreads_scraper.limiter.get_limits()}
+        return {key: self.state_store.get(key, default) for key, default in shared_keys.items()}
+
+    def sync_shared_sidebar(self):
+        if self.is_leader:
+            return
+        sidebar_version = self.state_store.get("sidebar_version")
+        if sidebar_version != self.shared_sidebar_version:
+            self.sidebar_index.rebuild(self.state_store.get("sidebar_items", []))
+            self.shared_sidebar_version = sidebar_version
+
+    def sidebar_summary(self):
+        self.sync_shared_sidebar()
+        return self.sidebar_index.get_summary()
+
+    def sidebar_page(self, query):
+        self.sync_shared_sidebar()
+        offset = max(0, int(query.get("offset") or 0))
+        limit = max(1, min(500, int(query.get("limit") or 100)))
+        page = self.sidebar_index.query(str(query.get("search") or ""), offset, limit)
+        seed_stats = None if self.is_leader else self.state_store.get("seed_stats", {})
+        for item in page["Items"]:
+            item["stats"] = self.crawl_scheduler.get_seed_stats(item["name"]) if seed_stats is None else seed_stats.get(item["name"])
+        return {**page, "Running": self.shared_state()["running"]}
+
+    def load_sidebar_page(self, sid, query):
+        try:
+            page = self.sidebar_page(query)
+            socketio.emit("sidebar_page", {**page, "Query_Id": query.get("query_id", 0)}, room=sid)
+
+        except Exception as e:
+            self.diagnostic_logger.error(f"Error Loading Sidebar Page: {str(e)}")
+
+    def select_sidebar_items(self, selection):
+        checked = bool(selection.get("checked"))
+        if selection.get("all"):
+            self.sidebar_index.select_matching(str(selection.get("search") or ""), checked)
+        else:
+            self.sidebar_index.select(selection.get("ids") or [], checked)
+        self.publish_state()
+        socketio.emit("sidebar_selection", self.sidebar_index.get_summary())
 
     def load_environ_or_config_settings(self):
         # Defaults
@@ -53,17 +253,34 @@ class DataHandler:
             "readarr_api_key": "",
             "root_folder_path": "/data/media/books",
             "google_books_api_key": "",
+            "google_books_cache_ttl": 720,
+            "google_books_prefetch": True,
             "readarr_api_timeout": 120.0,
+            "readarr_sync_workers": 8,
             "quality_profile_id": 1,
             "metadata_profile_id": 1,
             "search_for_missing_book": False,
             "minimum_rating": 3.5,
             "minimum_votes": 500,
             "goodreads_wait_delay": 12.5,
+            "goodreads_http_fast_path": True,
+            "goodreads_requests_per_second": 1.0,
+            "goodreads_max_requests_per_second": 4.0,
             "readarr_wait_delay": 7.5,
             "thread_limit": 1,
+            "driver_max_pages": 50,
+            "browser_memory_budget": 0,
+            "browser_memory_ceiling": 1024,
+            "image_proxy": True,
+            "image_cache_max_size": 200,
+            "recommendation_cache_ttl": 168,
+            "recommendation_cache_max_entries": 5000,
+            "recommendation_cache_force_refresh": False,
+            "crawl_max_depth": 2,
             "auto_start": False,
             "auto_start_delay": 60,
+            "state_backend": "memory",
+            "socketio_message_queue": "",
         }
 
         # Load settings from environmental variables (which take precedence) over the configuration file.
@@ -71,8 +288,14 @@ class DataHandler:
         self.readarr_api_key = os.environ.get("readarr_api_key", "")
         self.root_folder_path = os.environ.get("root_folder_path", "")
         self.google_books_api_key = os.environ.get("google_books_api_key", "")
+        google_books_cache_ttl = os.environ.get("google_books_cache_ttl", "")
+        self.google_books_cache_ttl = float(google_books_cache_ttl) if google_books_cache_ttl else ""
+        google_books_prefetch = os.environ.get("google_books_prefetch", "")
+        self.google_books_prefetch = google_books_prefetch.lower() == "true" if google_books_prefetch != "" else ""
         readarr_api_timeout = os.environ.get("readarr_api_timeout", "")
         self.readarr_api_timeout = float(readarr_api_timeout) if readarr_api_timeout else ""
+        readarr_sync_workers = os.environ.get("readarr_sync_workers", "")
+        self.readarr_sync_workers = int(readarr_sync_workers) if readarr_sync_workers else ""
         quality_profile_id = os.environ.get("quality_profile_id", "")
         self.quality_profile_id = int(quality_profile_id) if quality_profile_id else ""
         metadata_profile_id = os.environ.get("metadata_profile_id", "")
@@ -85,14 +308,40 @@ class DataHandler:
         self.minimum_votes = int(minimum_votes) if minimum_votes else ""
         goodreads_wait_delay = os.environ.get("goodreads_wait_delay", "")
         self.goodreads_wait_delay = float(goodreads_wait_delay) if goodreads_wait_delay else ""
+        goodreads_http_fast_path = os.environ.get("goodreads_http_fast_path", "")
+        self.goodreads_http_fast_path = goodreads_http_fast_path.lower() == "true" if goodreads_http_fast_path != "" else ""
+        goodreads_requests_per_second = os.environ.get("goodreads_requests_per_second", "")
+        self.goodreads_requests_per_second = float(goodreads_requests_per_second) if goodreads_requests_per_second else ""
+        goodreads_max_requests_per_second = os.environ.get("goodreads_max_requests_per_second", "")
+        self.goodreads_max_requests_per_second = float(goodreads_max_requests_per_second) if goodreads_max_requests_per_second else ""
         readarr_wait_delay = os.environ.get("readarr_wait_delay", "")
         self.readarr_wait_delay = float(readarr_wait_delay) if readarr_wait_delay else ""
         thread_limit = os.environ.get("thread_limit", "")
         self.thread_limit = int(thread_limit) if thread_limit else ""
+        driver_max_pages = os.environ.get("driver_max_pages", "")
+        self.driver_max_pages = int(driver_max_pages) if driver_max_pages else ""
+        browser_memory_budget = os.environ.get("browser_memory_budget", "")
+        self.browser_memory_budget = int(browser_memory_budget) if browser_memory_budget else ""
+        browser_memory_ceiling = os.environ.get("browser_memory_ceiling", "")
+        self.browser_memory_ceiling = int(browser_memory_ceiling) if browser_memory_ceiling else ""
+        image_proxy = os.environ.get("image_proxy", "")
+        self.image_proxy = image_proxy.lower() == "true" if image_proxy != "" else ""
+        image_cache_max_size = os.environ.get("image_cache_max_size", "")
+        self.image_cache_max_size = int(image_cache_max_size) if image_cache_max_size else ""
+        recommendation_cache_ttl = os.environ.get("recommendation_cache_ttl", "")
+        self.recommendation_cache_ttl = float(recommendation_cache_ttl) if recommendation_cache_ttl else ""
+        recommendation_cache_max_entries = os.environ.get("recommendation_cache_max_entries", "")
+        self.recommendation_cache_max_entries = int(recommendation_cache_max_entries) if recommendation_cache_max_entries else ""
+        recommendation_cache_force_refresh = os.environ.get("recommendation_cache_force_refresh", "")
+        self.recommendation_cache_force_refresh = recommendation_cache_force_refresh.lower() == "true" if recommendation_cache_force_refresh != "" else ""
+        crawl_max_depth = os.environ.get("crawl_max_depth", "")
+        self.crawl_max_depth = int(crawl_max_depth) if crawl_max_depth else ""
         auto_start = os.environ.get("auto_start", "")
         self.auto_start = auto_start.lower() == "true" if auto_start != "" else ""
         auto_start_delay = os.environ.get("auto_start_delay", "")
         self.auto_start_delay = float(auto_start_delay) if auto_start_delay else ""
+        self.state_backend = os.environ.get("state_backend", "")
+        self.socketio_message_queue = os.environ.get("socketio_message_queue", "")
 
         # Load variables from the configuration file if not set by environmental variables.
         try:
@@ -112,45 +361,102 @@ class DataHandler:
             if getattr(self, key) == "":
                 setattr(self, key, value)
 
+        # A rate of zero or below would stall the Goodreads token bucket
+        for key in ("goodreads_requests_per_second", "goodreads_max_requests_per_second"):
+            try:
+                valid_rate = float(getattr(self, key)) > 0
+            except (TypeError, ValueError):
+                valid_rate = False
+            if not valid_rate:
+                self.diagnostic_logger.error(f"Invalid {key}: {getattr(self, key)!r}, must be greater than 0. Using {default_settings[key]}")
+                setattr(self, key, default_settings[key])
+
         # Save config.
         self.save_config_to_file()
 
-    def automated_startup(self):
-        self.request_books_from_readarr(checked=True)
-        items = [x["name"] for x in self.readarr_items]
-        self.start(items)
+    def register_metrics(self):
+        self.metrics.describe("goodreads_stage_seconds", "Time spent in each GoodReads scraping stage")
+        self.metrics.describe("goodreads_recommendations_total", "GoodReads recommendation requests by retrieval path")
+        self.metrics.describe("readarr_sync_seconds", "Time spent in each Readarr library sync phase")
+        self.metrics.describe("readarr_add_seconds", "Time taken to process a batch of Readarr add requests")
+        self.metrics.describe("readarr_books_added_total", "Books processed by the Readarr add queue by status")
+        self.metrics.register_histogram_source("http_request_duration_seconds", "Latency of Readarr and Google Books requests", "endpoint", self.http_client.get_latency_histograms)
+        self.metrics.register_gauge("browser_drivers", "Pooled browser drivers by state", lambda: {state.lower(): count for state, count in self.goodreads_scraper.driver_pool.get_counts().items()})
+        self.metrics.register_gauge("browser_memory_megabytes", "Memory used by pooled browsers and available to the container", self.browser_memory_states)
+        self.metrics.register_gauge("recommended_books", "Number of recommended books held in memory", lambda: len(self.result_store))
+        self.metrics.register_gauge("connected_clients", "Number of connected Socket.IO clients", lambda: self.clients_connected_counter)
+        self.metrics.register_gauge("add_queue_length", "Books waiting in the Readarr add queue", lambda: self.add_queue.qsize())
+        self.metrics.register_gauge("goodreads_concurrency_limit", "Current adaptive limit on concurrent Goodreads scrapes", lambda: self.goodreads_scraper.limiter.get_limits()["Concurrency"])
+        self.metrics.register_gauge("goodreads_rate_limit", "Current Goodreads request rate limit per second", lambda: self.goodreads_scraper.limiter.get_limits()["Rate"])
+        self.metrics.register_gauge("image_cache_megabytes", "Disk space used by cached cover thumbnails", lambda: self.image_cache.get_stats()["Megabytes"])
+
+    def browser_memory_states(self):
+        memory_stats = self.memory_governor.get_stats()
+        states = {"current": memory_stats["Memory_MB"], "peak": memory_stats["Peak_Memory_MB"], "available": memory_stats["Available_MB"], "budget": memory_stats["Budget_MB"]}
+        return {state: value for state, value in states.items() if value is not None}
+
+    def automated_startup(self, reconcile_delay=0):
+        if self.readarr_items:
+            self.diagnostic_logger.info(f"Starting search from library snapshot of {len(self.readarr_items)} books")
+            self.start(resume=True)
+            reconcile_thread = threading.Timer(reconcile_delay, self.request_books_from_readarr, kwargs={"checked": True})
+            reconcile_thread.daemon = True
+            reconcile_thread.start()
+        else:
+            self.request_books_from_readarr(checked=True)
+            self.start(resume=True)
 
-    def connection(self):
-        if self.recommended_books:
-            if self.clients_connected_counter == 0:
-                if len(self.recommended_books) > 25:
-                    self.recommended_books = random.sample(self.recommended_books, 25)
-                else:
-                    self.diagnostic_logger.info(f"Shuffling Books")
-                    random.shuffle(self.recommended_books)
-            socketio.emit("more_books_loaded", self.recommended_books)
+    def load_library_snapshot(self):
+        snapshot = self.library_snapshot.load()
+        if not snapshot or snapshot.get("readarr_address") != self.readarr_address:
+            return
+        self.readarr_books_in_library = snapshot["library"]
+        self.library_index.rebuild(self.readarr_books_in_library, snapshot["saved_at"])
+        self.readarr_items = self.build_readarr_items(self.readarr_books_in_library, bool(self.auto_start))
+        self.sidebar_index.rebuild(self.readarr_items)
 
+    def build_readarr_items(self, books, checked):
+        readarr_items = [{"name": f"{book['author']} - {book['title']}", "checked": checked, "foreign_book_id": book["foreign_book_id"], "foreign_edition_id": book.get("foreign_edition_id")} for book in books]
+        return sorted(readarr_items, key=lambda x: x["name"])
+
+    def connection(self, sid):
         self.clients_connected_counter += 1
+        self.load_page(sid, {"query_id": 0})
+
+    def page_of_books(self, query):
+        page_query = {**_results.parse_page_query(query), "snapshots": self.ranking_snapshots}
+        if self.is_leader:
+            return self.result_store.page(**page_query)
+        return _results.select_page(self.state_store.get("recommended_books", []), **page_query)
+
+    def load_page(self, sid, query):
+        try:
+            page = self.page_of_books(query)
+            if page["Books"] or query.get("cursor") or query.get("query_id"):
+                socketio.emit("books_page", {**page, "Query_Id": query.get("query_id", 0)}, room=sid)
+
+        except Exception as e:
+            self.diagnostic_logger.error(f"Error Loading Page: {str(e)}")
+            socketio.emit("books_page", {"Books": [], "Next_Cursor": None, "Error": str(e), "Query_Id": query.get("query_id", 0)}, room=sid)
+            socketio.emit("new_toast_msg", {"title": "Failed to load books", "message": str(e)}, room=sid)
 
     def disconnection(self):
         self.clients_connected_counter = max(0, self.clients_connected_counter - 1)
 
-    def start(self, data):
+    def start(self, data=None, resume=False):
         try:
             socketio.emit("clear")
             self.search_exhausted_flag = False
-            self.books_to_use_in_search = []
-            self.recommended_books = []
-
-            for item in self.readarr_items:
-                item_name = item["name"]
-                if item_name in data:
-                    item["checked"] = True
-                    self.books_to_use_in_search.append(item_name)
-                else:
-                    item["checked"] = False
+            self.result_store.clear()
+            self.recommended_books_index.clear()
+            self.ranking_engine.clear()
+
+            if data is not None:
+                self.sidebar_index.select_names(data)
+            self.books_to_use_in_search = self.sidebar_index.selected_names()
 
             if self.books_to_use_in_search:
+                self.crawl_scheduler.start(self.books_to_use_in_search, resume)
                 self.stop_event.clear()
             else:
                 self.stop_event.set()
@@ -159,52 +465,34 @@ class DataHandler:
         except Exception as e:
             self.diagnostic_logger.error(f"Startup Error: {str(e)}")
             self.stop_event.set()
-            ret = {"Status": "Error", "Code": str(e), "Data": self.readarr_items, "Running": not self.stop_event.is_set()}
+            ret = {"Status": "Error", "Code": str(e), "Data": self.sidebar_index.get_summary(), "Running": not self.stop_event.is_set()}
             socketio.emit("readarr_sidebar_update", ret)
 
         else:
             thread = threading.Thread(target=data_handler.find_similar_books, name="Start_Finding_Thread")
             thread.daemon = True
             thread.start()
+            self.publish_state()
 
     def request_books_from_readarr(self, checked=False):
         try:
             self.diagnostic_logger.info(f"Getting Books from Readarr")
-            self.readarr_books_in_library = []
-            endpoint_authors = f"{self.readarr_address}/api/v1/author"
-            headers = {"Accept": "application/json", "X-Api-Key": self.readarr_api_key}
-            response_authors = requests.get(endpoint_authors, headers=headers, timeout=self.readarr_api_timeout)
-            if response_authors.status_code != 200:
-                raise Exception(f"Failed to fetch authors from Readarr: {response_authors.text}")
-
-            authors = response_authors.json()
-
-            for author in authors:
-                author_id = author["id"]
-                author_name = author["authorName"]
-
-                # Fetch books by author from Readarr
-                endpoint_books = f"{self.readarr_address}/api/v1/book?authorId={author_id}"
-                response_books = requests.get(endpoint_books, headers=headers, timeout=self.readarr_api_timeout)
-                if response_books.status_code != 200:
-                    raise Exception(f"Failed to fetch books by author '{author_name}' from Readarr: {response_books.text}")
-
-                books = response_books.json()
-
-                # Filter books with files
-                for book in books:
-                    if book.get("statistics", {}).get("bookFileCount", 0) > 0:
-                        self.readarr_books_in_library.append({"author": author_name, "title": book.get("title")})
-                        book_author_and_title = f'{author_name} - {book.get("title")}'
-                        cleaned_book = unidecode(book_author_and_title).lower()
-                        self.cleaned_readarr_items.append(cleaned_book)
-
-            self.readarr_items = [{"name": f"{book['author']} - {book['title']}", "checked": checked} for book in self.readarr_books_in_library]
-
+            snapshot = self.library_snapshot.data if self.library_snapshot.data and self.library_snapshot.data.get("readarr_address") == self.readarr_address else None
+            sync_started = time.time()
+            self.readarr_books_in_library = self.readarr_sync.fetch_library(self.readarr_address, self.readarr_api_key, self.readarr_api_timeout, self.readarr_sync_progress, snapshot)
+            self.library_index.rebuild(self.readarr_books_in_library, sync_started)
+            self.library_snapshot.save(self.readarr_books_in_library, self.readarr_sync.authors, self.readarr_address)
+            for phase, duration in self.readarr_sync.phase_timings.items():
+                self.metrics.observe("readarr_sync_seconds", duration, phase=phase)
+            self.readarr_author_index.load(self.readarr_sync.authors)
+            latency_summary = ", ".join(f"{name}: {histogram['Count']} requests, {histogram['Sum'] / max(1, histogram['Count']):.3f}s avg" for name, histogram in self.http_client.get_latency_histograms().items())
+            self.diagnostic_logger.info(f"HTTP latency - {latency_summary}")
+
+            self.readarr_items = self.build_readarr_items(self.readarr_books_in_library, checked)
+            self.sidebar_index.rebuild(self.readarr_items)
             status = "Success"
-            self.readarr_items = sorted(self.readarr_items, key=lambda x: x["name"])
 
-            ret = {"Status": status, "Code": response_books.status_code if status == "Error" else None, "Data": self.readarr_items, "Running": not self.stop_event.is_set()}
+            ret = {"Status": status, "Code": None, "Data": self.sidebar_index.get_summary(), "Running": not self.stop_event.is_set()}
 
         except Exception as e:
             self.diagnostic_logger.error(f"Error Getting Book list from Readarr: {str(e)}")
@@ -212,6 +500,19 @@ class DataHandler:
 
         finally:
             socketio.emit("readarr_sidebar_update", ret)
+            self.publish_state()
+
+    def get_seed_stats(self):
+        seed_stats = {}
+        for item in self.sidebar_index.export():
+            stats = self.crawl_scheduler.get_seed_stats(item["name"])
+            if stats:
+                seed_stats[item["name"]] = stats
+        return seed_stats
+
+    def readarr_sync_progress(self, completed, total):
+        if completed == 0 or completed == total or completed % 50 == 0:
+            socketio.emit("readarr_sync_progress", {"Completed": completed, "Total": total})
 
     def find_similar_books(self):
         if self.stop_event.is_set() or self.search_in_progress_flag:
@@ -226,14 +527,16 @@ class DataHandler:
 
                 self.search_exhausted_flag = True
                 self.search_in_progress_flag = True
+                self.book_emitter.reset_stats()
+                new_books_found = False
                 minimum_count = self.thread_limit if self.thread_limit > 1 and self.thread_limit < 16 else 6
-                sample_count = min(minimum_count, len(self.books_to_use_in_search))
-                random_books = random.sample(self.books_to_use_in_search, sample_count)
+                crawl_batch = self.crawl_scheduler.next_batch(minimum_count)
                 with concurrent.futures.ThreadPoolExecutor(max_workers=self.thread_limit) as executor:
-                    futures = [executor.submit(self.goodreads_scraper.goodreads_recommendations, book_name) for book_name in random_books]
+                    futures = {executor.submit(self.get_recommendations, book_name): (book_name, depth) for book_name, depth in crawl_batch}
                     for future in concurrent.futures.as_completed(futures):
                         related_books = future.result()
                         new_book_count = 0
+                        discovered_books = []
                         if self.stop_event.is_set():
                             for f in futures:
                                 f.cancel()
@@ -243,23 +546,32 @@ class DataHandler:
                                 for f in futures:
                                     f.cancel()
                                 break
-                            book_author_and_title = f"{book_item['Author']} - {book_item['Name']}"
-                            cleaned_book = unidecode(book_author_and_title).lower()
-                            if cleaned_book not in self.cleaned_readarr_items:
-                                for item in self.recommended_books:
-                                    match_ratio = fuzz.ratio(book_author_and_title, f"{item['Author']} - {item['Name']}")
-                                    if match_ratio > 95:
-                                        break
-                                else:
-                                    self.recommended_books.append(book_item)
-                                    socketio.emit("more_books_loaded", [book_item])
-                                    self.search_exhausted_flag = False
-                                    new_book_count += 1
+                            if self.library_index.contains(book_item["Author"], book_item["Name"]):
+                                continue
+                            entry_id, is_new_book = self.recommended_books_index.match_or_add(book_item["Author"], book_item["Name"])
+                            self.ranking_engine.add(entry_id, book_item)
+                            if is_new_book:
+                                if self.image_proxy:
+                                    book_item["Image_Link"] = self.image_cache.proxy_link(book_item["Image_Link"])
+                                self.result_store.add(entry_id, book_item)
+                                self.book_emitter.add(book_item)
+                                self.queue_google_books_prefetch(book_item)
+                                discovered_books.append(f"{book_item['Author']} - {book_item['Name']}")
+                                new_books_found = True
+                                new_book_count += 1
+                        book_name, depth = futures[future]
+                        self.crawl_scheduler.record_yield(book_name, len(related_books), new_book_count)
+                        self.crawl_scheduler.expand(discovered_books, depth)
+                        self.ranking_engine.rescore()
+                        self.book_emitter.flush()
+                        socketio.emit("books_ranked", self.ranking_engine.ranked_summary())
+                        self.publish_state()
 
                     if new_book_count > 0:
                         self.diagnostic_logger.info(f"Found {new_book_count} new suggestions that are not already in Readarr")
 
-                if self.search_exhausted_flag and not self.stop_event.is_set():
+                self.search_exhausted_flag = self.crawl_scheduler.is_exhausted()
+                if self.search_exhausted_flag and not new_books_found and not self.stop_event.is_set():
                     self.diagnostic_logger.info("Search Exhausted - Try selecting more books from existing Readarr library")
                     socketio.emit("new_toast_msg", {"title": "Search Exhausted", "message": "Try selecting more books from existing Readarr library"})
 
@@ -268,8 +580,13 @@ class DataHandler:
                 socketio.emit("new_toast_msg", {"title": "Search Failed", "message": "Check Logs...."})
 
             finally:
+                self.crawl_scheduler.requeue_unfinished()
+                self.crawl_scheduler.save()
+                self.search_exhausted_flag = self.crawl_scheduler.is_exhausted()
+                self.book_emitter.flush()
                 self.search_in_progress_flag = False
-                self.diagnostic_logger.info(f"Finished Searching")
+                self.diagnostic_logger.info(f"Finished Searching - Browser Pool: {self.goodreads_scraper.driver_pool.get_stats()} - Limits: {self.goodreads_scraper.limiter.get_limits()} - Emitted: {self.book_emitter.get_stats()}")
+                self.goodreads_scraper.driver_pool.close()
 
         elif self.search_exhausted_flag:
             try:
@@ -285,69 +602,165 @@ class DataHandler:
                 self.search_in_progress_flag = False
                 self.diagnostic_logger.info(f"Finished Searching")
 
-    def add_to_readarr(self, book_data):
+    def get_goodreads_book_link(self, book_name):
+        item = self.sidebar_index.find(book_name)
+        if not item:
+            return None
+        foreign_edition_id = str(item.get("foreign_edition_id") or "")
+        foreign_book_id = str(item.get("foreign_book_id") or "")
+        if foreign_edition_id.isdigit():
+            return f"{self.goodreads_scraper.base_url}/book/show/{foreign_edition_id}"
+        if foreign_book_id.isdigit():
+            return f"{self.goodreads_scraper.base_url}/work/best_book/{foreign_book_id}"
+        return None
+
+    def get_recommendations(self, book_name):
+        if not self.recommendation_cache_force_refresh:
+            cached_books = self.recommendation_cache.get(book_name)
+            if cached_books is not None:
+                self.metrics.increment("goodreads_recommendations_total", path="cache")
+                self.diagnostic_logger.info(f"Using {len(cached_books)} cached recommendations for {book_name}")
+                return cached_books
+
+        related_books = self.goodreads_scraper.goodreads_recommendations(book_name, self.get_goodreads_book_link(book_name))
+        if related_books and not self.stop_event.is_set():
+            self.recommendation_cache.put(book_name, related_books)
+        return related_books
+
+    def fetch_cover_image(self, url):
+        return _images.read_image_response(self.http_client.get("images", url, stream=True), 10 * 1024 * 1024)
+
+    def load_cover(self, url):
         try:
-            book_name = book_data["Name"]
-            author_name = book_data["Author"]
-            book_author_and_title = f"{author_name} - {book_name}"
-            author_data = self._readarr_author_lookup(author_name)
-            status = self._readarr_book_lookup(author_data, book_name)
-
-            if status == "Success":
-                self.readarr_items.append({"name": book_author_and_title, "checked": False})
-                cleaned_book = unidecode(book_author_and_title).lower()
-                self.cleaned_readarr_items.append(cleaned_book)
-                self.diagnostic_logger.info(f"Book: {book_author_and_title} successfully added to Readarr.")
-                status = "Added"
-            else:
-                status = "Failed to Add"
-                self.diagnostic_logger.info(f"Failed to add to Readarr as no matching book for: {book_author_and_title}.")
-                socketio.emit("new_toast_msg", {"title": "Failed to add Book", "message": f"No Matching Book for: {book_author_and_title}"})
-
-            for item in self.recommended_books:
-                if item["Name"] == book_name and item["Author"] == author_name:
-                    item["Status"] = status
-                    socketio.emit("refresh_book", item)
-                    break
-            else:
-                self.diagnostic_logger.info(f"{item['Author']} - {item['Name']} not found in Similar Book List")
+            return self.image_cache.get(url)
+
+        except ValueError:
+            raise
 
         except Exception as e:
-            self.diagnostic_logger.error(f"Error Adding Book to Readarr: {str(e)}")
+            self.diagnostic_logger.error(f"Error Loading Cover: {str(e)}")
+            return None
 
-    def _readarr_book_lookup(self, author_data, book_name):
-        try:
+    def add_to_readarr(self, book_data):
+        self.add_queue.put(book_data)
+
+    def process_add_queue(self):
+        while True:
+            batch = [self.add_queue.get()]
+            while True:
+                try:
+                    batch.append(self.add_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                batch_start = time.monotonic()
+                self._add_batch_to_readarr(batch)
+                self.metrics.observe_since("readarr_add_seconds", batch_start)
+
+            except Exception as e:
+                self.diagnostic_logger.error(f"Error Adding Books to Readarr: {str(e)}")
+                for book_data in batch:
+                    self._update_add_status(book_data, "Failed to Add")
+
+    def _add_batch_to_readarr(self, batch):
+        books_by_author = {}
+        for book_data in batch:
+            books_by_author.setdefault(book_data["Author"], []).append(book_data)
+
+        author_lookups = {}
+        new_author_added = False
+        for author_name, author_books in books_by_author.items():
+            try:
+                author_data, author_created = self._readarr_author_lookup(author_name)
+                author_lookups[author_name] = author_data
+                new_author_added = new_author_added or author_created
+
+            except Exception as e:
+                self.diagnostic_logger.error(f"Error Adding Book to Readarr: {str(e)}")
+                for book_data in author_books:
+                    self._update_add_status(book_data, "Failed to Add")
+
+        if new_author_added:
             time.sleep(self.readarr_wait_delay)
+
+        book_ids = {}
+        for author_name, author_data in author_lookups.items():
+            book_names = [book_data["Name"] for book_data in books_by_author[author_name]]
+            book_ids[author_name] = self._readarr_book_lookup(author_data, book_names)
+
+        monitored = self._readarr_monitor_books([book_id for author_book_ids in book_ids.values() for book_id in author_book_ids.values() if book_id])
+        for author_name in author_lookups:
+            for book_data in books_by_author[author_name]:
+                book_name = book_data["Name"]
+                book_author_and_title = f"{author_name} - {book_name}"
+                if book_ids[author_name].get(book_name) and monitored:
+                    readarr_item = {"name": book_author_and_title, "checked": False}
+                    self.readarr_items.append(readarr_item)
+                    self.sidebar_index.add(readarr_item)
+                    self.library_index.add(author_name, book_name)
+                    self.diagnostic_logger.info(f"Book: {book_author_and_title} successfully added to Readarr.")
+                    self._update_add_status(book_data, "Added")
+                else:
+                    self.diagnostic_logger.info(f"Failed to add to Readarr as no matching book for: {book_author_and_title}.")
+                    socketio.emit("new_toast_msg", {"title": "Failed to add Book", "message": f"No Matching Book for: {book_author_and_title}"})
+                    self._update_add_status(book_data, "Failed to Add")
+
+    def _update_add_status(self, book_data, status):
+        self.metrics.increment("readarr_books_added_total", status=status)
+        item = self.result_store.find(book_data["Author"], book_data["Name"])
+        if item:
+            item["Status"] = status
+            self.result_store.mark_changed()
+            socketio.emit("refresh_book", item)
+            self.publish_state()
+        else:
+            self.diagnostic_logger.info(f"{book_data['Author']} - {book_data['Name']} not found in Similar Book List")
+
+    def _readarr_book_lookup(self, author_data, book_names):
+        book_ids = {}
+        try:
             headers = {"Content-Type": "application/json", "X-Api-Key": self.readarr_api_key}
             readarr_book_url = f"{self.readarr_address}/api/v1/book"
-            readarr_book_monitor_url = f"{self.readarr_address}/api/v1/book/monitor"
 
-            author_books_response = requests.get(f"{readarr_book_url}?authorId={author_data.get('id')}", headers=headers)
+            author_books_response = self.http_client.get("readarr", f"{readarr_book_url}?authorId={author_data.get('id')}", headers=headers)
             if author_books_response.status_code != 200:
                 raise Exception(f"Failed to get books from author: {author_books_response.content.decode('utf-8')}")
 
-            # Find a match for the requested book
+            # Find a match for each requested book
             author_books_data = author_books_response.json()
-            for book_item in author_books_data:
-                match_ratio = fuzz.ratio(book_item["title"], book_name)
-                if match_ratio > 90:
-                    book_data = book_item
-                    break
-            else:
-                raise Exception(f"Book: {book_name} not found in Readarr under author: {author_data.get('authorName')}.")
+            for book_name in book_names:
+                for book_item in author_books_data:
+                    match_ratio = fuzz.ratio(book_item["title"], book_name)
+                    if match_ratio > 90:
+                        book_ids[book_name] = book_item.get("id")
+                        break
+                else:
+                    self.diagnostic_logger.error(f"Book: {book_name} not found in Readarr under author: {author_data.get('authorName')}.")
 
-            payload = {"bookIds": [book_data.get("id")], "monitored": True}
-            response = requests.put(readarr_book_monitor_url, headers=headers, json=payload)
+        except Exception as e:
+            self.diagnostic_logger.error(f"Book not added Readarr: {str(e)}")
+
+        return book_ids
+
+    def _readarr_monitor_books(self, book_ids):
+        try:
+            if not book_ids:
+                return False
+            headers = {"Content-Type": "application/json", "X-Api-Key": self.readarr_api_key}
+            readarr_book_monitor_url = f"{self.readarr_address}/api/v1/book/monitor"
+            payload = {"bookIds": book_ids, "monitored": True}
+            response = self.http_client.put("readarr", readarr_book_monitor_url, headers=headers, json=payload)
             if response.status_code == 202:
-                self.diagnostic_logger.info(f"Book: {book_name} monitoring status updated successfully.")
-                return "Success"
+                self.diagnostic_logger.info(f"Monitoring status updated successfully for {len(book_ids)} books.")
+                return True
             else:
-                self.diagnostic_logger.error(f"Failed to update monitoring status for Book: {book_name}. Error: {response.content.decode('utf-8')}")
-                return "Failure"
+                self.diagnostic_logger.error(f"Failed to update monitoring status for {len(book_ids)} books. Error: {response.content.decode('utf-8')}")
+                return False
 
         except Exception as e:
-            self.diagnostic_logger.error(f"Book not added Readarr: {str(e)}")
-            return "Failure"
+            self.diagnostic_logger.error(f"Books not monitored in Readarr: {str(e)}")
+            return False
 
     def _readarr_author_lookup(self, author_name):
         readarr_author_lookup_url = f"{self.readarr_address}/api/v1/author/lookup"
@@ -356,55 +769,53 @@ class DataHandler:
         headers = {"Content-Type": "application/json", "X-Api-Key": self.readarr_api_key}
 
         # Check if the author exists in Readarr
-        author_response = requests.get(readarr_author_url, headers=headers)
-        authors = author_response.json()
-
-        if author_response.status_code == 200:
-            for author in authors:
-                match_ratio = fuzz.ratio(author["authorName"], author_name)
-                if match_ratio > 95:
-                    author_data = author
-                    break
-            else:
-                author_data = None
-
-        if not author_data:
-            # Search for Author
-            author_lookup = requests.get(readarr_author_lookup_url, params=params, headers=headers)
-            if author_lookup.status_code != 200:
-                raise Exception(f"Readarr Lookup failed: {author_lookup.content.decode('utf-8')}")
-
-            search_results = author_lookup.json()
-            for result in search_results:
-                match_ratio = fuzz.ratio(result["authorName"], author_name)
-                if match_ratio > 95:
-                    author_data = result
-                    break
-            else:
-                raise Exception(f"No match for: {author_name}")
-
-            # Add Author as not in Readdar
-            author_payload = {
-                "authorName": author_data.get("authorName"),
-                "metadataProfileId": self.metadata_profile_id,
-                "qualityProfileId": self.quality_profile_id,
-                "rootFolderPath": self.root_folder_path,
-                "path": os.path.join(self.root_folder_path, author_data.get("authorName")),
-                "foreignAuthorId": author_data.get("foreignAuthorId"),
+        author_data = self.readarr_author_index.find(author_name)
+        if not author_data and self.readarr_author_index.is_stale():
+            author_response = self.http_client.get("readarr", readarr_author_url, headers=headers, conditional=True)
+            if author_response.status_code == 200:
+                self.readarr_author_index.load(author_response.json())
+                author_data = self.readarr_author_index.find(author_name)
+
+        if author_data:
+            return author_data, False
+
+        # Search for Author
+        author_lookup = self.http_client.get("readarr", readarr_author_lookup_url, params=params, headers=headers)
+        if author_lookup.status_code != 200:
+            raise Exception(f"Readarr Lookup failed: {author_lookup.content.decode('utf-8')}")
+
+        search_results = author_lookup.json()
+        for result in search_results:
+            match_ratio = fuzz.ratio(result["authorName"], author_name)
+            if match_ratio > 95:
+                author_data = result
+                break
+        else:
+            raise Exception(f"No match for: {author_name}")
+
+        # Add Author as not in Readdar
+        author_payload = {
+            "authorName": author_data.get("authorName"),
+            "metadataProfileId": self.metadata_profile_id,
+            "qualityProfileId": self.quality_profile_id,
+            "rootFolderPath": self.root_folder_path,
+            "path": os.path.join(self.root_folder_path, author_data.get("authorName")),
+            "foreignAuthorId": author_data.get("foreignAuthorId"),
+            "monitored": True,
+            "monitorNewItems": "none",
+            "addOptions": {
+                "monitor": "future",
+                "searchForMissingBooks": self.search_for_missing_book,
                 "monitored": True,
-                "monitorNewItems": "none",
-                "addOptions": {
-                    "monitor": "future",
-                    "searchForMissingBooks": self.search_for_missing_book,
-                    "monitored": True,
-                },
-            }
-            author_response = requests.post(readarr_author_url, headers=headers, json=author_payload)
-            author_data = author_response.json()
-            if author_response.status_code != 201:
-                raise Exception(f"Failed to add author: {author_response.content.decode('utf-8')}")
+            },
+        }
+        author_response = self.http_client.post("readarr", readarr_author_url, headers=headers, json=author_payload)
+        author_data = author_response.json()
+        if author_response.status_code != 201:
+            raise Exception(f"Failed to add author: {author_response.content.decode('utf-8')}")
 
-        return author_data
+        self.readarr_author_index.add(author_data)
+        return author_data, True
 
     def load_settings(self):
         try:
@@ -414,7 +825,7 @@ class DataHandler:
                 "root_folder_path": self.root_folder_path,
                 "google_books_api_key": self.google_books_api_key,
             }
-            socketio.emit("settings_loaded", data)
+            socketio.emit("settings_loaded", data, room=request.sid)
         except Exception as e:
             self.diagnostic_logger.error(f"Failed to load settings: {str(e)}")
 
@@ -436,17 +847,34 @@ class DataHandler:
                         "readarr_api_key": self.readarr_api_key,
                         "root_folder_path": self.root_folder_path,
                         "google_books_api_key": self.google_books_api_key,
+                        "google_books_cache_ttl": self.google_books_cache_ttl,
+                        "google_books_prefetch": self.google_books_prefetch,
                         "readarr_api_timeout": float(self.readarr_api_timeout),
+                        "readarr_sync_workers": self.readarr_sync_workers,
                         "quality_profile_id": self.quality_profile_id,
                         "metadata_profile_id": self.metadata_profile_id,
                         "search_for_missing_book": self.search_for_missing_book,
                         "minimum_rating": self.minimum_rating,
                         "minimum_votes": self.minimum_votes,
                         "goodreads_wait_delay": self.goodreads_wait_delay,
+                        "goodreads_http_fast_path": self.goodreads_http_fast_path,
+                        "goodreads_requests_per_second": self.goodreads_requests_per_second,
+                        "goodreads_max_requests_per_second": self.goodreads_max_requests_per_second,
                         "readarr_wait_delay": self.readarr_wait_delay,
                         "thread_limit": self.thread_limit,
+                        "driver_max_pages": self.driver_max_pages,
+                        "browser_memory_budget": self.browser_memory_budget,
+                        "browser_memory_ceiling": self.browser_memory_ceiling,
+                        "image_proxy": self.image_proxy,
+                        "image_cache_max_size": self.image_cache_max_size,
+                        "recommendation_cache_ttl": self.recommendation_cache_ttl,
+                        "recommendation_cache_max_entries": self.recommendation_cache_max_entries,
+                        "recommendation_cache_force_refresh": self.recommendation_cache_force_refresh,
+                        "crawl_max_depth": self.crawl_max_depth,
                         "auto_start": self.auto_start,
                         "auto_start_delay": self.auto_start_delay,
+                        "state_backend": self.state_backend,
+                        "socketio_message_queue": self.socketio_message_queue,
                     },
                     json_file,
                     indent=4,
@@ -458,10 +886,16 @@ class DataHandler:
     def query_google_books(self, book):
         try:
             book_info = {}
-            url = "https://www.googleapis.com/books/v1/volumes"
             query = f'{book["Author"]} - {book["Name"]}'
-            params = {"q": query.replace(" ", "+"), "key": self.google_books_api_key}
-            response = requests.get(url, params=params)
+            cache_key = query.lower()
+            cached_book_info = self.google_books_cache.get(cache_key)
+            if cached_book_info is not None:
+                return cached_book_info
+
+            url = "https://www.googleapis.com/books/v1/volumes"
+            params = {"q": query.replace(" ", "+"), "key": self.google_books_api_key, "fields": "items(volumeInfo(title,authors,description,publishedDate,pageCount))"}
+            response = self.http_client.get("google_books", url, params=params)
+            response.raise_for_status()
             data = response.json()
             if "items" in data:
                 for book_item in data["items"]:
@@ -473,6 +907,7 @@ class DataHandler:
                     match_ratio = fuzz.ratio(book_string, query)
                     if match_ratio > 90 or query in book_string:
                         break
+            self.google_books_cache.put(cache_key, book_info)
 
         except Exception as e:
             self.diagnostic_logger.error(f"Error retrieving book Data from Google Books API: {str(e)}")
@@ -480,12 +915,41 @@ class DataHandler:
         finally:
             return book_info
 
+    def enrich_book(self, book):
+        book_info = self.query_google_books(book)
+        book["Overview"] = book_info.get("description", "")
+        book["Published_Date"] = book_info.get("publishedDate")
+        book["Page_Count"] = book_info.get("pageCount")
+
+    def queue_google_books_prefetch(self, book):
+        # Without a key every lookup shares the anonymous quota, so overviews are only fetched on demand
+        if not self.google_books_prefetch or not self.google_books_api_key:
+            return
+        if self.google_books_prefetch_thread is None:
+            self.google_books_prefetch_thread = threading.Thread(target=self.prefetch_google_books, name="Google_Books_Prefetch_Thread")
+            self.google_books_prefetch_thread.daemon = True
+            self.google_books_prefetch_thread.start()
+        try:
+            self.google_books_prefetch_queue.put_nowait(book)
+        except queue.Full:
+            pass
+
+    def prefetch_google_books(self):
+        never_stop = threading.Event()
+        while True:
+            book = self.google_books_prefetch_queue.get()
+            try:
+                if not book.get("Overview") and self.google_books_api_key:
+                    self.google_books_prefetch_bucket.acquire(never_stop)
+                    self.enrich_book(book)
+
+            except Exception as e:
+                self.diagnostic_logger.error(f"Error prefetching book overview: {str(e)}")
+
     def overview(self, book):
         try:
-            book_info = self.query_google_books(book)
-            book["Overview"] = book_info.get("description", "")
-            book["Published_Date"] = book_info.get("publishedDate")
-            book["Page_Count"] = book_info.get("pageCount")
+            if not book.get("Overview"):
+                self.enrich_book(book)
 
         except Exception as e:
             self.diagnostic_logger.error(f"Error retrieving book overview: {str(e)}")
@@ -496,8 +960,9 @@ class DataHandler:
 
 app = Flask(__name__)
 app.secret_key = "secret_key"
-socketio = SocketIO(app)
+socketio = SocketIO()
 data_handler = DataHandler()
+socketio.init_app(app, **data_handler.socketio_options())
 
 
 @app.route("/")
@@ -505,30 +970,76 @@ def home():
     return render_template("base.html")
 
 
+@app.route("/metrics")
+def metrics():
+    return Response(data_handler.metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/cover")
+def cover():
+    image_url = request.args.get("url", "")
+    try:
+        cover_image = data_handler.load_cover(image_url)
+    except ValueError:
+        return Response("Image host not allowed", status=400)
+    if not cover_image:
+        return redirect(image_url)
+    image_path, etag = cover_image
+    response = send_file(image_path, mimetype="image/jpeg", etag=etag, conditional=True, max_age=31536000)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+@app.route("/api/books")
+def books():
+    try:
+        return jsonify(data_handler.page_of_books(request.args))
+    except ValueError as e:
+        return jsonify({"Status": "Error", "Code": str(e)}), 400
+
+
+@app.route("/api/sidebar")
+def sidebar():
+    try:
+        return jsonify(data_handler.sidebar_page(request.args))
+    except ValueError as e:
+        return jsonify({"Status": "Error", "Code": str(e)}), 400
+
+
 @socketio.on("side_bar_opened")
 def side_bar_opened():
-    if data_handler.readarr_items:
-        ret = {"Status": "Success", "Data": data_handler.readarr_items, "Running": not data_handler.stop_event.is_set()}
-        socketio.emit("readarr_sidebar_update", ret)
+    shared_state = data_handler.shared_state()
+    sidebar_summary = data_handler.sidebar_summary()
+    if sidebar_summary["Total"]:
+        ret = {"Status": "Success", "Data": sidebar_summary, "Running": shared_state["running"]}
+        socketio.emit("readarr_sidebar_update", ret, room=request.sid)
+    socketio.emit("goodreads_limits", shared_state["goodreads_limits"], room=request.sid)
+
+
+@socketio.on("sidebar_query")
+def sidebar_query(query):
+    data_handler.load_sidebar_page(request.sid, query or {})
+
+
+@socketio.on("sidebar_select")
+def sidebar_select(selection):
+    data_handler.submit_command("sidebar_select", selection or {})
 
 
 @socketio.on("get_readarr_books")
 def get_readarr_books():
-    thread = threading.Thread(target=data_handler.request_books_from_readarr, name="Readarr_Thread")
-    thread.daemon = True
-    thread.start()
+    data_handler.submit_command("get_readarr_books")
 
 
 @socketio.on("adder")
 def add_to_readarr(book):
-    thread = threading.Thread(target=data_handler.add_to_readarr, args=(book,), name="Add_Book_Thread")
-    thread.daemon = True
-    thread.start()
+    data_handler.submit_command("adder", book)
 
 
 @socketio.on("connect")
 def connection():
-    thread = threading.Thread(target=data_handler.connection, name="Connect")
+    thread = threading.Thread(target=data_handler.connection, args=(request.sid,), name="Connect")
     thread.daemon = True
     thread.start()
 
@@ -545,25 +1056,29 @@ def load_settings():
 
 @socketio.on("update_settings")
 def update_settings(data):
-    data_handler.update_settings(data)
-    data_handler.save_config_to_file()
+    if not data_handler.is_leader:
+        data_handler.update_settings(data)
+    data_handler.submit_command("update_settings", data)
 
 
 @socketio.on("start_req")
 def starter(data):
-    data_handler.start(data)
+    data_handler.submit_command("start_req", data)
 
 
 @socketio.on("stop_req")
 def stopper():
-    data_handler.stop_event.set()
+    data_handler.submit_command("stop_req")
 
 
 @socketio.on("load_more_books")
 def load_more_books():
-    thread = threading.Thread(target=data_handler.find_similar_books, name="Find_Similar")
-    thread.daemon = True
-    thread.start()
+    data_handler.submit_command("load_more_books")
+
+
+@socketio.on("load_page")
+def load_page(query):
+    data_handler.load_page(request.sid, query or {})
 
 
 @socketio.on("overview_req")
@@ -2,10 +2,12 @@ var return_to_top = document.getElementById("return-to-top");
 var readarr_get_books_button = document.getElementById('readarr-get-books-button');
 var start_stop_button = document.getElementById('start-stop-button');
 var readarr_status = document.getElementById('readarr-status');
+var goodreads_limits = document.getElementById('goodreads-limits');
 var readarr_spinner = document.getElementById('readarr-spinner');
 var readarr_item_list = document.getElementById("readarr-item-list");
 var readarr_select_all_checkbox = document.getElementById("readarr-select-all");
 var readarr_select_all_container = document.getElementById("readarr-select-all-container");
+var readarr_search = document.getElementById("readarr-search");
 var config_modal = document.getElementById('config-modal');
 var readarr_sidebar = document.getElementById('readarr-sidebar');
 var save_message = document.getElementById("save-message");
@@ -14,51 +16,166 @@ const readarr_address = document.getElementById("readarr-address");
 const readarr_api_key = document.getElementById("readarr-api-key");
 const root_folder_path = document.getElementById("root-folder-path");
 const google_books_api_key = document.getElementById("googlebooks-api-key");
-var readarr_items = [];
-var socket = io();
-
-function check_if_all_selected() {
-    var checkboxes = document.querySelectorAll('input[name="readarr-item"]');
-    var all_checked = true;
-    for (var i = 0; i < checkboxes.length; i++) {
-        if (!checkboxes[i].checked) {
-            all_checked = false;
-            break;
-        }
-    }
-    readarr_select_all_checkbox.checked = all_checked;
-}
+const book_sort = document.getElementById("book-sort");
+const book_author_filter = document.getElementById("book-author-filter");
+const book_seed_filter = document.getElementById("book-seed-filter");
+const book_rating_filter = document.getElementById("book-rating-filter");
+var sidebar_row_height = 28;
+var sidebar_page_size = 100;
+var sidebar_total = 0;
+var sidebar_running = false;
+var sidebar_query_id = 0;
+var sidebar_pages = {};
+var sidebar_pending_pages = new Set();
+var sidebar_search_timer = null;
+var sidebar_render_pending = false;
+var readarr_item_spacer = null;
+var page_query_id = 0;
+var next_page_cursor = null;
+var page_request_pending = false;
+var book_filter_timer = null;
+var shown_book_ids = new Set();
+var socket = io({ transports: ["websocket", "polling"] });
 
 function load_readarr_data(response) {
-    var every_check_box = document.querySelectorAll('input[name="readarr-item"]');
+    sidebar_running = response.Running;
     if (response.Running) {
         start_stop_button.classList.remove('btn-success');
         start_stop_button.classList.add('btn-warning');
         start_stop_button.textContent = "Stop";
-        every_check_box.forEach(item => {
-            item.disabled = true;
-        });
         readarr_select_all_checkbox.disabled = true;
         readarr_get_books_button.disabled = true;
     } else {
         start_stop_button.classList.add('btn-success');
         start_stop_button.classList.remove('btn-warning');
         start_stop_button.textContent = "Start";
-        every_check_box.forEach(item => {
-            item.disabled = false;
-        });
         readarr_select_all_checkbox.disabled = false;
         readarr_get_books_button.disabled = false;
     }
-    check_if_all_selected();
+    render_sidebar_rows();
+}
+
+function reset_sidebar_list() {
+    sidebar_query_id += 1;
+    sidebar_total = 0;
+    sidebar_pages = {};
+    sidebar_pending_pages.clear();
+    readarr_item_list.innerHTML = '';
+    readarr_item_list.scrollTop = 0;
+    readarr_item_spacer = document.createElement("div");
+    readarr_item_spacer.style.position = "relative";
+    readarr_item_list.appendChild(readarr_item_spacer);
+    request_sidebar_page(0, false);
+}
+
+function request_sidebar_page(offset, force) {
+    if (!force && (sidebar_pages[offset] || sidebar_pending_pages.has(offset))) {
+        return;
+    }
+    sidebar_pending_pages.add(offset);
+    socket.emit("sidebar_query", { "search": readarr_search.value.trim(), "offset": offset, "limit": sidebar_page_size, "query_id": sidebar_query_id });
+}
+
+function visible_sidebar_rows() {
+    // The list must scroll itself, a list that grows to its content would otherwise render every row
+    var visible_height = Math.min(readarr_item_list.clientHeight, window.innerHeight);
+    var first_row = Math.max(0, Math.floor(readarr_item_list.scrollTop / sidebar_row_height) - 10);
+    var last_row = Math.min(sidebar_total, Math.ceil((readarr_item_list.scrollTop + visible_height) / sidebar_row_height) + 10);
+    return [first_row, last_row];
+}
+
+function create_sidebar_row(item, row) {
+    var div = document.createElement("div");
+    div.className = "form-check text-nowrap overflow-hidden";
+    div.style.position = "absolute";
+    div.style.top = `${row * sidebar_row_height}px`;
+    div.style.left = "0";
+    div.style.right = "0";
+    div.style.height = `${sidebar_row_height}px`;
+
+    var input = document.createElement("input");
+    input.type = "checkbox";
+    input.className = "form-check-input";
+    input.id = "readarr-" + item.id;
+    input.name = "readarr-item";
+    input.value = item.name;
+    input.checked = item.checked;
+    input.disabled = sidebar_running;
+
+    var label = document.createElement("label");
+    label.className = "form-check-label";
+    label.htmlFor = "readarr-" + item.id;
+    label.textContent = item.name;
+
+    if (item.stats) {
+        var stats = document.createElement("small");
+        stats.className = "text-muted ms-1";
+        stats.textContent = `(${item.stats.accepted} new of ${item.stats.returned} found)`;
+        label.appendChild(stats);
+    }
+
+    input.addEventListener("change", function () {
+        item.checked = this.checked;
+        socket.emit("sidebar_select", { "ids": [item.id], "checked": this.checked });
+    });
+
+    div.appendChild(input);
+    div.appendChild(label);
+    return div;
+}
+
+function render_sidebar_rows() {
+    if (!readarr_item_spacer) {
+        return;
+    }
+    readarr_item_spacer.style.height = `${sidebar_total * sidebar_row_height}px`;
+    var [first_row, last_row] = visible_sidebar_rows();
+    var fragment = document.createDocumentFragment();
+    for (var row = first_row; row < last_row; row++) {
+        var page_offset = Math.floor(row / sidebar_page_size) * sidebar_page_size;
+        var page = sidebar_pages[page_offset];
+        if (!page) {
+            request_sidebar_page(page_offset, false);
+            continue;
+        }
+        var item = page[row - page_offset];
+        if (item) {
+            fragment.appendChild(create_sidebar_row(item, row));
+        }
+    }
+    readarr_item_spacer.replaceChildren(fragment);
+}
+
+function refresh_sidebar_pages() {
+    var [first_row, last_row] = visible_sidebar_rows();
+    var first_page = Math.floor(first_row / sidebar_page_size) * sidebar_page_size;
+    sidebar_query_id += 1;
+    sidebar_pending_pages.clear();
+    Object.keys(sidebar_pages).map(Number).forEach(function (offset) {
+        if (offset < first_page || offset >= last_row) {
+            delete sidebar_pages[offset];
+        }
+    });
+    for (var offset = first_page; offset < Math.max(last_row, 1); offset += sidebar_page_size) {
+        request_sidebar_page(offset, true);
+    }
 }
 
 function append_books(books) {
     var book_row = document.getElementById('book-row');
     var template = document.getElementById('book-template');
+    var fragment = document.createDocumentFragment();
     books.forEach(function (book) {
+        if (book.Id !== undefined) {
+            if (shown_book_ids.has(book.Id)) {
+                return;
+            }
+            shown_book_ids.add(book.Id);
+        }
         var clone = document.importNode(template.content, true);
         var book_col = clone.querySelector('#book-column');
+        book_col.dataset.key = `${book.Author} - ${book.Name}`;
+        book_col.book_data = book;
 
         book_col.querySelector('.card-title').textContent = `${book.Name}`;
         if (book.Image_Link) {
@@ -97,8 +214,9 @@ function append_books(books) {
         } else {
             book_col.querySelector('.card-body').classList.add('status-blue');
         }
-        book_row.appendChild(clone);
+        fragment.appendChild(clone);
     });
+    book_row.appendChild(fragment);
 }
 
 function add_to_readarr(book) {
@@ -133,10 +251,28 @@ return_to_top.addEventListener("click", function () {
 
 readarr_select_all_checkbox.addEventListener("change", function () {
     var is_checked = this.checked;
-    var checkboxes = document.querySelectorAll('input[name="readarr-item"]');
-    checkboxes.forEach(function (checkbox) {
-        checkbox.checked = is_checked;
+    Object.values(sidebar_pages).forEach(function (page) {
+        page.forEach(function (item) {
+            item.checked = is_checked;
+        });
     });
+    render_sidebar_rows();
+    socket.emit("sidebar_select", { "all": true, "search": readarr_search.value.trim(), "checked": is_checked });
+});
+
+readarr_search.addEventListener("input", function () {
+    clearTimeout(sidebar_search_timer);
+    sidebar_search_timer = setTimeout(reset_sidebar_list, 250);
+});
+
+readarr_item_list.addEventListener("scroll", function () {
+    if (!sidebar_render_pending) {
+        sidebar_render_pending = true;
+        requestAnimationFrame(function () {
+            sidebar_render_pending = false;
+            render_sidebar_rows();
+        });
+    }
 });
 
 readarr_get_books_button.addEventListener('click', function () {
@@ -144,6 +280,7 @@ readarr_get_books_button.addEventListener('click', function () {
     readarr_spinner.classList.remove('d-none');
     readarr_status.textContent = "Accessing Readarr API";
     readarr_item_list.innerHTML = '';
+    readarr_item_spacer = null;
     socket.emit("get_readarr_books");
 });
 
@@ -153,22 +290,18 @@ start_stop_button.addEventListener('click', function () {
         start_stop_button.classList.remove('btn-success');
         start_stop_button.classList.add('btn-warning');
         start_stop_button.textContent = "Stop";
-        var checked_items = Array.from(document.querySelectorAll('input[name="readarr-item"]:checked'))
-            .map(item => item.value);
-        document.querySelectorAll('input[name="readarr-item"]').forEach(item => {
-            item.disabled = true;
-        });
+        sidebar_running = true;
+        render_sidebar_rows();
         readarr_get_books_button.disabled = true;
         readarr_select_all_checkbox.disabled = true;
-        socket.emit("start_req", checked_items);
+        socket.emit("start_req", null);
     }
     else {
         start_stop_button.classList.add('btn-success');
         start_stop_button.classList.remove('btn-warning');
         start_stop_button.textContent = "Start";
-        document.querySelectorAll('input[name="readarr-item"]').forEach(item => {
-            item.disabled = false;
-        });
+        sidebar_running = false;
+        render_sidebar_rows();
         readarr_get_books_button.disabled = false;
         readarr_select_all_checkbox.disabled = false;
         socket.emit("stop_req");
@@ -205,63 +338,77 @@ readarr_sidebar.addEventListener('show.bs.offcanvas', function (event) {
     socket.emit("side_bar_opened");
 });
 
+readarr_sidebar.addEventListener('shown.bs.offcanvas', function (event) {
+    render_sidebar_rows();
+});
+
+function book_query() {
+    return {
+        "sort": book_sort.value,
+        "author": book_author_filter.value.trim(),
+        "seed": book_seed_filter.value.trim(),
+        "minimum_rating": book_rating_filter.value,
+    };
+}
+
+function is_default_book_query() {
+    var query = book_query();
+    return query.sort === "score" && !query.author && !query.seed && !query.minimum_rating;
+}
+
+function request_first_page() {
+    page_query_id += 1;
+    next_page_cursor = null;
+    page_request_pending = true;
+    clear_all();
+    socket.emit("load_page", { ...book_query(), "query_id": page_query_id });
+}
+
+function load_next_page_or_more_books() {
+    if (page_request_pending) {
+        return;
+    }
+    if (next_page_cursor) {
+        page_request_pending = true;
+        socket.emit("load_page", { ...book_query(), "query_id": page_query_id, "cursor": next_page_cursor });
+    } else {
+        load_more_books_req();
+    }
+}
+
+[book_author_filter, book_seed_filter, book_rating_filter].forEach(function (filter_input) {
+    filter_input.addEventListener('input', function () {
+        clearTimeout(book_filter_timer);
+        book_filter_timer = setTimeout(request_first_page, 300);
+    });
+});
+
+book_sort.addEventListener('change', request_first_page);
+
 window.addEventListener('scroll', function () {
     if (window.innerHeight + window.scrollY >= document.body.offsetHeight) {
-        load_more_books_req();
+        load_next_page_or_more_books();
     }
 });
 
 window.addEventListener('touchmove', function () {
     if (window.innerHeight + window.scrollY >= document.body.offsetHeight) {
-        load_more_books_req();
+        load_next_page_or_more_books();
     }
 });
 
 window.addEventListener('touchend', () => {
     const { scrollHeight, scrollTop, clientHeight } = document.documentElement;
     if (Math.abs(scrollHeight - clientHeight - scrollTop) < 1) {
-        load_more_books_req();
+        load_next_page_or_more_books();
     }
 });
 
 socket.on("readarr_sidebar_update", (response) => {
     if (response.Status == "Success") {
-        readarr_status.textContent = "Readarr List Retrieved";
-        readarr_items = response.Data;
-        readarr_item_list.innerHTML = '';
+        readarr_status.textContent = `Readarr List Retrieved: ${response.Data.Selected} of ${response.Data.Total} selected`;
         readarr_select_all_container.classList.remove('d-none');
-
-        for (var i = 0; i < readarr_items.length; i++) {
-            var item = readarr_items[i];
-
-            var div = document.createElement("div");
-            div.className = "form-check";
-
-            var input = document.createElement("input");
-            input.type = "checkbox";
-            input.className = "form-check-input";
-            input.id = "readarr-" + i;
-            input.name = "readarr-item";
-            input.value = item.name;
-
-            if (item.checked) {
-                input.checked = true;
-            }
-
-            var label = document.createElement("label");
-            label.className = "form-check-label";
-            label.htmlFor = "readarr-" + i;
-            label.textContent = item.name;
-
-            input.addEventListener("change", function () {
-                check_if_all_selected();
-            });
-
-            div.appendChild(input);
-            div.appendChild(label);
-
-            readarr_item_list.appendChild(div);
-        }
+        reset_sidebar_list();
     }
     else {
         readarr_status.textContent = response.Code;
@@ -271,6 +418,31 @@ socket.on("readarr_sidebar_update", (response) => {
     load_readarr_data(response);
 });
 
+socket.on("sidebar_page", (page) => {
+    if (page.Query_Id !== sidebar_query_id) {
+        return;
+    }
+    sidebar_pending_pages.delete(page.Offset);
+    sidebar_pages[page.Offset] = page.Items;
+    sidebar_total = page.Total;
+    sidebar_running = page.Running;
+    readarr_select_all_checkbox.checked = page.Total > 0 && page.Matching_Selected === page.Total;
+    render_sidebar_rows();
+});
+
+socket.on("sidebar_selection", (summary) => {
+    readarr_status.textContent = `Readarr List Retrieved: ${summary.Selected} of ${summary.Total} selected`;
+    refresh_sidebar_pages();
+});
+
+socket.on("readarr_sync_progress", (progress) => {
+    readarr_status.textContent = `Retrieving Books: ${progress.Completed} of ${progress.Total} Authors`;
+});
+
+socket.on("goodreads_limits", (limits) => {
+    goodreads_limits.textContent = `Goodreads: ${limits.Concurrency} of ${limits.Max_Concurrency} threads, ${limits.Rate.toFixed(2)} requests/s`;
+});
+
 socket.on("refresh_book", (book) => {
     var book_cards = document.querySelectorAll('#book-column');
     book_cards.forEach(function (card) {
@@ -304,10 +476,47 @@ socket.on("refresh_book", (book) => {
 });
 
 socket.on('more_books_loaded', function (data) {
-    append_books(data);
+    if (is_default_book_query()) {
+        append_books(data);
+    }
+});
+
+socket.on('books_page', function (page) {
+    if (page.Query_Id !== page_query_id) {
+        return;
+    }
+    page_request_pending = false;
+    next_page_cursor = page.Next_Cursor;
+    if (page.Error) {
+        return;
+    }
+    append_books(page.Books);
+});
+
+socket.on('books_ranked', function (ranked_books) {
+    if (book_sort.value !== "score") {
+        return;
+    }
+    var book_row = document.getElementById('book-row');
+    var cards_by_key = {};
+    book_row.querySelectorAll('#book-column').forEach(function (card) {
+        cards_by_key[card.dataset.key] = card;
+    });
+    var fragment = document.createDocumentFragment();
+    ranked_books.forEach(function (ranked_book) {
+        var card = cards_by_key[ranked_book.Key];
+        if (card) {
+            card.book_data.Score = ranked_book.Score;
+            card.book_data.Recommended_By = ranked_book.Recommended_By;
+            fragment.appendChild(card);
+        }
+    });
+    var template = document.getElementById('book-template');
+    book_row.insertBefore(fragment, template.nextSibling);
 });
 
 socket.on('clear', function () {
+    next_page_cursor = null;
     clear_all();
 });
 
@@ -315,6 +524,16 @@ socket.on("new_toast_msg", function (data) {
     book_toast(data.title, data.message);
 });
 
+socket.on("connect", function () {
+    if (is_default_book_query()) {
+        page_query_id = 0;
+        next_page_cursor = null;
+        page_request_pending = false;
+    } else {
+        request_first_page();
+    }
+});
+
 socket.on("disconnect", function () {
     book_toast("Connection Lost", "Please refresh to continue.");
     clear_all();
@@ -326,6 +545,7 @@ function clear_all() {
     book_cards.forEach(function (card) {
         card.remove();
     });
+    shown_book_ids.clear();
 }
 
 let overview_request_flag = false;
@@ -360,7 +580,7 @@ function book_overview_modal(book) {
     var modal_body = document.getElementById('modal-body');
 
     modal_title.textContent = `${book.Author} - ${book.Name}`;
-    modal_body.innerHTML = `${book.Overview}<br><br>Published Date: ${book.Published_Date}<br>Page Count: ${book.Page_Count}<br><br>Recommendation from: ${book.Base_Book}`;
+    modal_body.innerHTML = `${book.Overview}<br><br>Published Date: ${book.Published_Date}<br>Page Count: ${book.Page_Count}<br><br>Recommendation from: ${(book.Recommended_By || [book.Base_Book]).join(", ")}`;
 
     var overview_modal = new bootstrap.Modal(document.getElementById('overview-modal'));
     overview_modal.show();
@@ -0,0 +1,136 @@
+import io
+import time
+import logging
+import threading
+import pytest
+from PIL import Image
+import _images
+
+COVER_URL = "https://i.gr-assets.com/images/S/compressed.photo.goodreads.com/books/1546071216i/5907.jpg"
+
+
+def make_image(width=600, height=900, color="navy"):
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(output, "PNG")
+    return output.getvalue()
+
+
+class Local_Covers:
+    def __init__(self, delay=0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.requested = []
+
+    def __call__(self, url):
+        self.requested.append(url)
+        time.sleep(self.delay)
+        if self.fail:
+            raise Exception("Upstream unavailable")
+        return make_image()
+
+
+class Streamed_Response:
+    def __init__(self, body, status_code=200, headers=None):
+        self.body = body
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.read_bytes = 0
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for position in range(0, len(self.body), chunk_size):
+            self.read_bytes += len(self.body[position : position + chunk_size])
+            yield self.body[position : position + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+def create_cache(folder, fetch, max_bytes=1024 * 1024):
+    return _images.Image_Cache(logging.getLogger("test"), str(folder), fetch, max_bytes)
+
+
+def test_get_stores_thumbnail_once(tmp_path):
+    local_covers = Local_Covers()
+    image_cache = create_cache(tmp_path, local_covers)
+
+    image_path, key = image_cache.get(COVER_URL)
+    assert image_cache.get(COVER_URL) == (image_path, key)
+    assert local_covers.requested == [COVER_URL]
+    with Image.open(image_path) as thumbnail:
+        assert thumbnail.format == "JPEG"
+        assert thumbnail.size == (240, 360)
+    assert image_cache.get_stats()["Hits"] == 1
+
+
+def test_concurrent_gets_share_one_fetch(tmp_path):
+    local_covers = Local_Covers(delay=0.2)
+    image_cache = create_cache(tmp_path, local_covers)
+
+    threads = [threading.Thread(target=image_cache.get, args=(COVER_URL,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert local_covers.requested == [COVER_URL]
+    assert image_cache.key_locks == {}
+
+
+def test_failed_fetch_releases_key_lock(tmp_path):
+    local_covers = Local_Covers(fail=True)
+    image_cache = create_cache(tmp_path, local_covers)
+
+    with pytest.raises(Exception, match="Upstream unavailable"):
+        image_cache.get(COVER_URL)
+    assert image_cache.key_locks == {}
+
+    local_covers.fail = False
+    image_cache.get(COVER_URL)
+    assert len(local_covers.requested) == 2
+
+
+def test_rejects_other_hosts(tmp_path):
+    local_covers = Local_Covers()
+    image_cache = create_cache(tmp_path, local_covers)
+
+    with pytest.raises(ValueError):
+        image_cache.get("http://169.254.169.254/latest/meta-data")
+    assert image_cache.proxy_link("https://example.com/cover.jpg") == "https://example.com/cover.jpg"
+    assert image_cache.proxy_link(COVER_URL).startswith("cover?url=https%3A%2F%2Fi.gr-assets.com")
+    assert local_covers.requested == []
+
+
+def test_evicts_least_recently_used_and_reloads(tmp_path):
+    image_cache = create_cache(tmp_path, Local_Covers())
+    image_cache.get(COVER_URL)
+    thumbnail_size = image_cache.total_bytes
+
+    image_cache = create_cache(tmp_path, Local_Covers(), max_bytes=thumbnail_size * 2)
+    assert len(image_cache.entries) == 1
+    image_cache.get(f"{COVER_URL}?v=2")
+    image_cache.get(f"{COVER_URL}?v=3")
+    assert len(image_cache.entries) == 2
+    assert image_cache.cache_key(COVER_URL) not in image_cache.entries
+    assert not (tmp_path / f"{image_cache.cache_key(COVER_URL)}.jpg").exists()
+
+
+def test_read_image_response_stops_at_limit():
+    response = Streamed_Response(b"x" * 1000)
+    with pytest.raises(Exception, match="larger than 100 bytes"):
+        _images.read_image_response(response, 100, chunk_size=64)
+    assert response.read_bytes == 128
+    assert response.closed
+
+
+def test_read_image_response_checks_content_length_and_status():
+    response = Streamed_Response(b"x" * 1000, headers={"Content-Length": "1000"})
+    with pytest.raises(Exception, match="too large"):
+        _images.read_image_response(response, 100)
+    assert response.read_bytes == 0
+
+    with pytest.raises(Exception, match="404"):
+        _images.read_image_response(Streamed_Response(b"", status_code=404), 100)
+
+    response = Streamed_Response(b"cover")
+    assert _images.read_image_response(response, 100) == b"cover"
+    assert response.closed
@@ -0,0 +1,69 @@
+import os
+import pytest
+import _scrapers
+
+FIXTURES_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def read_fixture(file_name):
+    with open(os.path.join(FIXTURES_FOLDER, file_name), encoding="utf-8") as fixture_file:
+        return fixture_file.read()
+
+
+def test_parse_search_results():
+    results = _scrapers.parse_search_results(read_fixture("goodreads_search.html"))
+
+    assert [result["title"] for result in results] == [
+        "The Hobbit (The Lord of the Rings, #0)",
+        "J.R.R. Tolkien 4-Book Boxed Set: The Hobbit & The Lord of the Rings",
+        "The Hobbit: Graphic Novel",
+    ]
+    assert results[0]["author"] == "J.R.R. Tolkien"
+    assert results[0]["link"] == "https://www.goodreads.com/book/show/5907.The_Hobbit?from_search=true&from_srp=true&qid=xSjm2Q0mVu&rank=1"
+    # Only the first contributor of a row is kept, roles such as (Illustrator) are skipped
+    assert results[2]["author"] == "Chuck Dixon"
+
+
+def test_parse_search_results_uses_base_url():
+    results = _scrapers.parse_search_results(read_fixture("goodreads_search.html"), "http://127.0.0.1:8080")
+    assert results[1]["link"].startswith("http://127.0.0.1:8080/book/show/30.J_R_R_Tolkien_4_Book_Boxed_Set?")
+
+
+def test_parse_related_books():
+    related_books = _scrapers.parse_related_books(read_fixture("goodreads_book.html"))
+
+    # The edge whose book is missing from the apollo state is dropped
+    assert related_books == [
+        {
+            "title": "The Fellowship of the Ring (The Lord of the Rings, #1)",
+            "author": "J.R.R. Tolkien",
+            "rating": 4.39,
+            "votes": 3024476,
+            "image_url": "https://images-na.ssl-images-amazon.com/images/S/compressed.photo.goodreads.com/books/1654215925i/61215351._SY75_.jpg",
+        },
+        {
+            "title": "The Chronicles of Narnia (Chronicles of Narnia, #1-7)",
+            "author": "C.S. Lewis",
+            "rating": 4.28,
+            "votes": 673513,
+            "image_url": "https://images-na.ssl-images-amazon.com/images/S/compressed.photo.goodreads.com/books/1661032875i/11127._SY75_.jpg",
+        },
+        {
+            "title": "A Wizard of Earthsea (The Earthsea Cycle, #1)",
+            "author": "Ursula K. Le Guin",
+            "rating": 4.02,
+            "votes": 309121,
+            "image_url": "https://images-na.ssl-images-amazon.com/images/S/compressed.photo.goodreads.com/books/1353424536i/13642._SY75_.jpg",
+        },
+    ]
+
+
+@pytest.mark.parametrize("page_html", ["<html><body>No data</body></html>", read_fixture("goodreads_search.html")])
+def test_parse_related_books_without_next_data(page_html):
+    assert _scrapers.parse_related_books(page_html) == []
+
+
+def test_parse_page_title():
+    assert _scrapers.parse_page_title(read_fixture("goodreads_book.html")) == "The Hobbit (The Lord of the Rings, #0) by J.R.R. Tolkien | Goodreads"
+    assert _scrapers.parse_page_title(read_fixture("goodreads_search.html")) == 'Search results for "The Hobbit" (showing 1-20 of 2,414 books)'
+    assert _scrapers.parse_page_title("<html><body></body></html>") == ""